@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import json
+
+from .runner import format_results, run_scenario
+from .scenarios import SCENARIOS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run coinslib benchmarks")
+    parser.add_argument("scenarios", nargs="*", choices=[[], *SCENARIOS])
+    parser.add_argument("--operations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--response-size", type=int, default=0)
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false")
+    parser.add_argument("--json", action="store_true")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        results.append(
+            await run_scenario(
+                name,
+                SCENARIOS[name],
+                operations=args.operations,
+                concurrency=args.concurrency,
+                latency=args.latency,
+                response_size=args.response_size,
+                trace_memory=args.trace_memory,
+            )
+        )
+    if args.json:
+        print(json.dumps([result._asdict() for result in results], indent=2))
+    else:
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,389 @@
+import asyncio
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+from itertools import count
+
+from aiohttp import web
+
+
+class MockNode(ABC):
+    def __init__(self, latency: float = 0.0, response_size: int = 0):
+        self.latency = latency
+        self.response_size = response_size
+        self.calls: Counter[str] = Counter()
+        self.http_requests = 0
+        self._runner: web.AppRunner | None = None
+        self._ids = count()
+
+    @property
+    def rpc_count(self) -> int:
+        return sum(self.calls.values())
+
+    def padding(self) -> str:
+        return "0" * self.response_size
+
+    def next_hash(self) -> str:
+        return hashlib.sha256(str(next(self._ids)).encode()).hexdigest()
+
+    async def start(self) -> str:
+        app = web.Application(client_max_size=64 * 1024**2)
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            await runner.cleanup()
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.http_requests = 0
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        body = await request.json() if request.can_read_body else {}
+        return web.json_response(self.respond(request.path, body))
+
+    @abstractmethod
+    def respond(self, path: str, body):
+        ...
+
+
+class JSONRPCNode(MockNode):
+    def respond(self, path: str, body):
+        if isinstance(body, list):
+            return [self._call(path, call) for call in body]
+        return self._call(path, body)
+
+    def _call(self, path: str, call: dict) -> dict:
+        method = call["method"]
+        self.calls[method] += 1
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            error = {"code": -32601, "message": f"Method not found: {method}"}
+            return {"id": call.get("id"), "result": None, "error": error}
+        try:
+            result = handler(path, call.get("params") or [])
+        except LookupError as exc:
+            error = {"code": -5, "message": str(exc)}
+            return {"id": call.get("id"), "result": None, "error": error}
+        return {"id": call.get("id"), "result": result, "error": None}
+
+
+class BitcoindMock(JSONRPCNode):
+    def __init__(self, *args, block_size: int = 100, height: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.block_size = block_size
+        self.height = height
+        self.transactions: dict[str, dict] = {}
+
+    def _wallet(self, path: str) -> str:
+        return path.rsplit("/wallet/", 1)[-1] if "/wallet/" in path else ""
+
+    def _record(self, outputs: dict[str, float], wallet: str = "") -> str:
+        txid = self.next_hash()
+        self.transactions[txid] = {
+            "txid": txid,
+            "amount": -sum(outputs.values()),
+            "confirmations": 1,
+            "details": [
+                {
+                    "address": address,
+                    "category": "send",
+                    "amount": -amount,
+                    "vout": vout,
+                    "account": wallet,
+                }
+                for vout, (address, amount) in enumerate(outputs.items())
+            ],
+            "hex": self.padding(),
+        }
+        return txid
+
+    def rpc_getbalance(self, path, params):
+        return 12.5
+
+    def rpc_createwallet(self, path, params):
+        return {"name": params["wallet_name"], "warning": ""}
+
+    def rpc_loadwallet(self, path, params):
+        return {"name": params[0], "warning": ""}
+
+    def rpc_unloadwallet(self, path, params):
+        return {"warning": ""}
+
+    def rpc_getnewaddress(self, path, params):
+        return "bc1q" + self.next_hash()[:38]
+
+    def rpc_getaddressesbylabel(self, path, params):
+        return {"bc1q" + self.next_hash()[:38]: {"purpose": "receive"}}
+
+    def rpc_sendtoaddress(self, path, params):
+        return self._record({params[0]: params[1]}, self._wallet(path))
+
+    def rpc_sendmany(self, path, params):
+        return self._record(params[1], self._wallet(path))
+
+    def rpc_gettransaction(self, path, params):
+        transaction = self.transactions.get(params[0])
+        if transaction is None:
+            return {
+                "txid": params[0],
+                "amount": 0.1,
+                "confirmations": 3,
+                "blockhash": f"{self.height - 2:064x}",
+                "blockheight": self.height - 2,
+                "details": [
+                    {"address": "bc1qdeposit", "category": "receive", "amount": 0.1}
+                ],
+                "hex": self.padding(),
+            }
+        return transaction
+
+    def rpc_getrawtransaction(self, path, params):
+        return {"txid": params[0], "vin": [], "vout": [], "hex": self.padding()}
+
+    def rpc_listtransactions(self, path, params):
+        return [
+            {"txid": self.next_hash(), "amount": 0.1, "category": "receive"}
+            for _ in range(10)
+        ]
+
+    def rpc_listsinceblock(self, path, params):
+        return {
+            "transactions": [
+                {
+                    "txid": self.next_hash(),
+                    "amount": 0.1,
+                    "category": "receive",
+                    "address": "bc1qdeposit",
+                }
+                for _ in range(10)
+            ],
+            "lastblock": f"{self.height:064x}",
+        }
+
+    def rpc_getblockcount(self, path, params):
+        return self.height
+
+    def rpc_getblockhash(self, path, params):
+        return f"{params[0]:064x}"
+
+    def rpc_getbestblockhash(self, path, params):
+        return f"{self.height:064x}"
+
+    def rpc_getblock(self, path, params):
+        height = int(params[0], 16)
+        txids = [f"{height:032x}{index:032x}" for index in range(self.block_size)]
+        verbose_transactions = len(params) > 1 and params[1] == 2
+        return {
+            "hash": params[0],
+            "height": height,
+            "previousblockhash": f"{height - 1:064x}",
+            "tx": [
+                {"txid": txid, "vin": [], "vout": [], "hex": self.padding()}
+                for txid in txids
+            ]
+            if verbose_transactions
+            else txids,
+        }
+
+    def rpc_listunspent(self, path, params):
+        return [
+            {
+                "txid": self.next_hash(),
+                "vout": 0,
+                "amount": 0.01,
+                "spendable": True,
+            }
+        ]
+
+    def rpc_estimatesmartfee(self, path, params):
+        return {"feerate": 0.0001, "blocks": params[0]}
+
+    def rpc_createpsbt(self, path, params):
+        return "cHNidP8" + self.next_hash()
+
+    def rpc_walletprocesspsbt(self, path, params):
+        return {"psbt": params[0], "complete": False}
+
+    def rpc_combinepsbt(self, path, params):
+        return params[0][0]
+
+    def rpc_finalizepsbt(self, path, params):
+        return {"hex": self.padding() or "00", "complete": True}
+
+    def rpc_sendrawtransaction(self, path, params):
+        return self.next_hash()
+
+
+class DogecoindMock(BitcoindMock):
+    def rpc_getbalance(self, path, params):
+        return 125.0
+
+    def rpc_getaccountaddress(self, path, params):
+        return "D" + self.next_hash()[:33]
+
+    def rpc_getnewaddress(self, path, params):
+        return "D" + self.next_hash()[:33]
+
+    def rpc_sendfrom(self, path, params):
+        return self._record({params[1]: params[2]}, params[0])
+
+    def rpc_sendmany(self, path, params):
+        return self._record(params[1], params[0])
+
+    def rpc_move(self, path, params):
+        return True
+
+
+class EvmNodeMock(JSONRPCNode):
+    def __init__(self, *args, chain_id: int = 1, height: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chain_id = chain_id
+        self.height = height
+        self.nonces: dict[str, int] = {}
+
+    def _call(self, path: str, call: dict) -> dict:
+        response = super()._call(path, call)
+        response["jsonrpc"] = "2.0"
+        if response["error"] is None:
+            del response["error"]
+        else:
+            del response["result"]
+        return response
+
+    def rpc_eth_chainId(self, path, params):
+        return hex(self.chain_id)
+
+    def rpc_eth_blockNumber(self, path, params):
+        return hex(self.height)
+
+    def rpc_eth_getBalance(self, path, params):
+        return hex(10**18)
+
+    def rpc_eth_gasPrice(self, path, params):
+        return hex(5 * 10**9)
+
+    def rpc_eth_feeHistory(self, path, params):
+        blocks = int(params[0], 16) if isinstance(params[0], str) else params[0]
+        return {
+            "oldestBlock": hex(self.height - blocks),
+            "baseFeePerGas": [hex(10**9)] * (blocks + 1),
+            "gasUsedRatio": [0.5] * blocks,
+            "reward": [[hex(10**8), hex(2 * 10**8), hex(3 * 10**8)]] * blocks,
+        }
+
+    def rpc_eth_getTransactionCount(self, path, params):
+        return hex(self.nonces.get(params[0].lower(), 0))
+
+    def rpc_eth_estimateGas(self, path, params):
+        return hex(21000)
+
+    def rpc_eth_getCode(self, path, params):
+        return "0x"
+
+    def rpc_eth_call(self, path, params):
+        return "0x" + f"{10**18:064x}"
+
+    def rpc_eth_sendRawTransaction(self, path, params):
+        return "0x" + self.next_hash()
+
+    def rpc_eth_getTransactionByHash(self, path, params):
+        return {
+            "blockHash": "0x" + "11" * 32,
+            "blockNumber": hex(self.height - 10),
+            "from": "0x" + "22" * 20,
+            "gas": hex(21000),
+            "gasPrice": hex(10**9),
+            "hash": params[0],
+            "input": "0x" + self.padding(),
+            "nonce": "0x0",
+            "to": "0x" + "33" * 20,
+            "transactionIndex": "0x0",
+            "value": "0x0",
+            "v": "0x1b",
+            "r": "0x1",
+            "s": "0x1",
+            "type": "0x0",
+            "chainId": hex(self.chain_id),
+        }
+
+
+TRC20_ABI = [
+    {
+        "outputs": [{"type": "uint8"}],
+        "constant": True,
+        "name": "decimals",
+        "stateMutability": "View",
+        "type": "Function",
+    },
+    {
+        "outputs": [{"type": "uint256"}],
+        "constant": True,
+        "inputs": [{"name": "who", "type": "address"}],
+        "name": "balanceOf",
+        "stateMutability": "View",
+        "type": "Function",
+    },
+    {
+        "outputs": [{"type": "bool"}],
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "transfer",
+        "stateMutability": "Nonpayable",
+        "type": "Function",
+    },
+]
+
+
+class TronGridMock(MockNode):
+    def __init__(self, *args, height: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.height = height
+
+    async def start(self) -> str:
+        return await super().start() + "/"
+
+    def respond(self, path: str, body):
+        path = path.strip("/")
+        self.calls[path] += 1
+        if path == "wallet/getcontract":
+            return {
+                "contract_address": body["value"],
+                "name": "TetherToken",
+                "abi": {"entrys": TRC20_ABI},
+            }
+        if path == "wallet/triggerconstantcontract":
+            value = 6 if body["function_selector"].startswith("decimals") else 10**7
+            return {"result": {"result": True}, "constant_result": [f"{value:064x}"]}
+        if path == "wallet/getnodeinfo":
+            block_id = f"{self.height:016x}" + "ab" * 24
+            return {"solidityBlock": f"Num:{self.height},ID:{block_id}"}
+        if path == "wallet/getsignweight":
+            raw_data = json.dumps(body["raw_data"], sort_keys=True).encode()
+            txid = hashlib.sha256(raw_data).hexdigest()
+            return {"transaction": {"transaction": {"txID": txid}}, "permission": None}
+        if path == "wallet/broadcasttransaction":
+            return {"result": True, "txid": body["txID"]}
+        if path == "wallet/gettransactioninfobyid":
+            return {
+                "id": body["value"],
+                "blockNumber": self.height,
+                "receipt": {"result": "SUCCESS"},
+                "log": self.padding(),
+            }
+        if path == "wallet/gettransactionbyid":
+            return {"txID": body["value"], "ret": [{"contractRet": "SUCCESS"}]}
+        return {"Error": f"Unknown endpoint {path}"}
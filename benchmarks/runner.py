@@ -0,0 +1,109 @@
+import asyncio
+import tracemalloc
+from time import perf_counter
+from typing import Awaitable, Callable, NamedTuple
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    operations: int
+    concurrency: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50: float
+    p99: float
+    rpcs_per_operation: float
+    http_requests_per_operation: float
+    peak_memory_kb: int | None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_operations(
+    operation: Callable[[int], Awaitable],
+    operations: int,
+    concurrency: int,
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    indexes = iter(range(operations))
+
+    async def worker():
+        nonlocal errors
+        for index in indexes:
+            started = perf_counter()
+            try:
+                await operation(index)
+            except Exception:
+                errors += 1
+            latencies.append(perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies), errors
+
+
+async def run_scenario(
+    name: str,
+    scenario,
+    operations: int = 1000,
+    concurrency: int = 50,
+    latency: float = 0.0,
+    response_size: int = 0,
+    trace_memory: bool = True,
+) -> BenchmarkResult:
+    node = scenario.node(latency=latency, response_size=response_size)
+    url = await node.start()
+    try:
+        service, operation = await scenario.setup(url)
+        try:
+            await operation(0)
+            node.reset_counters()
+            if trace_memory:
+                tracemalloc.start()
+            started = perf_counter()
+            latencies, errors = await run_operations(operation, operations, concurrency)
+            seconds = perf_counter() - started
+            peak_memory_kb = None
+            if trace_memory:
+                peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+        finally:
+            await service.close()
+    finally:
+        await node.stop()
+    return BenchmarkResult(
+        name=name,
+        operations=operations,
+        concurrency=concurrency,
+        errors=errors,
+        seconds=seconds,
+        throughput=operations / seconds if seconds else 0.0,
+        p50=percentile(latencies, 0.50),
+        p99=percentile(latencies, 0.99),
+        rpcs_per_operation=node.rpc_count / operations,
+        http_requests_per_operation=node.http_requests / operations,
+        peak_memory_kb=peak_memory_kb,
+    )
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    header = (
+        f"{'scenario':<28}{'ops':>7}{'conc':>6}{'errors':>8}{'ops/s':>10}"
+        f"{'p50 ms':>10}{'p99 ms':>10}{'rpc/op':>9}{'http/op':>9}{'mem KB':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        memory = "-" if result.peak_memory_kb is None else result.peak_memory_kb
+        lines.append(
+            f"{result.name:<28}{result.operations:>7}{result.concurrency:>6}"
+            f"{result.errors:>8}{result.throughput:>10.1f}"
+            f"{result.p50 * 1000:>10.2f}{result.p99 * 1000:>10.2f}"
+            f"{result.rpcs_per_operation:>9.2f}"
+            f"{result.http_requests_per_operation:>9.2f}{memory:>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,148 @@
+from typing import Awaitable, Callable, NamedTuple
+
+from eth_account import Account
+
+from ..coins.bnb import BinanceCoin
+from ..coins.btc import Bitcoin
+from ..coins.doge import Doge
+from ..coins.eth import Ethereum
+from ..coins.tron import Tron
+from .mock_nodes import (
+    BitcoindMock,
+    DogecoindMock,
+    EvmNodeMock,
+    MockNode,
+    TronGridMock,
+)
+
+
+USDT_CONTRACT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+TRON_RECIPIENT = "TJRabPrwbZy45sbavfcjinPJC18kjpRTv8"
+EVM_RECIPIENT = "0x" + "33" * 20
+BEP20_CONTRACT = "0x55d398326f99059fF775485246999027B3197955"
+
+
+class Scenario(NamedTuple):
+    node: type[MockNode]
+    setup: Callable[[str], Awaitable[tuple]]
+
+
+async def btc_balance(url: str):
+    service = Bitcoin("user", "password", url)
+    return service, lambda index: service.get_balance(f"wallet{index % 100}")
+
+
+async def btc_send(url: str):
+    service = Bitcoin("user", "password", url)
+    return service, lambda index: service.send(f"bc1qrecipient{index}", 0.001)
+
+
+async def btc_send_batched(url: str):
+    service = Bitcoin("user", "password", url, payout_window=0.05)
+    return service, lambda index: service.send_batched(f"bc1qrecipient{index}", 0.001)
+
+
+async def btc_sum_and_address(url: str):
+    service = Bitcoin("user", "password", url)
+    return service, lambda index: service.get_sum_and_address(
+        f"tag{index % 50}", f"{index:064x}"
+    )
+
+
+async def btc_confs_many(url: str):
+    service = Bitcoin("user", "password", url)
+    return service, lambda index: service.get_confs_many(
+        [f"{index:032x}{offset:032x}" for offset in range(100)]
+    )
+
+
+async def btc_scan_block(url: str):
+    service = Bitcoin("user", "password", url)
+
+    async def operation(index: int):
+        async for _ in service.scan_blocks(900 + index % 100, 900 + index % 100):
+            pass
+
+    return service, operation
+
+
+async def btc_stream_block(url: str):
+    service = Bitcoin("user", "password", url, json_decoder="fast")
+
+    async def operation(index: int):
+        async for _ in service.iter_block_transactions(900 + index % 100):
+            pass
+
+    return service, operation
+
+
+async def doge_send(url: str):
+    service = Doge("user", "password", url)
+    return service, lambda index: service.send(f"Drecipient{index}", 1.0)
+
+
+async def doge_sum_and_address(url: str):
+    service = Doge("user", "password", url)
+    return service, lambda index: service.get_sum_and_address(
+        f"tag{index % 50}", f"{index:064x}"
+    )
+
+
+async def eth_balance(url: str):
+    service = Ethereum("user", "password", url)
+    return service, lambda index: service.balance(EVM_RECIPIENT)
+
+
+async def eth_send(url: str):
+    service = Ethereum("user", "password", url)
+    sender = Account.create()
+    return service, lambda index: service.send(
+        EVM_RECIPIENT, "0.001", sender.address, sender.key
+    )
+
+
+async def eth_confs(url: str):
+    service = Ethereum("user", "password", url)
+    return service, lambda index: service.get_confs(f"0x{index:064x}")
+
+
+async def bnb_token_send(url: str):
+    service = BinanceCoin("user", "password", url)
+    sender = Account.create()
+    return service, lambda index: service.send(
+        EVM_RECIPIENT,
+        "0.001",
+        sender.address,
+        sender.key.hex(),
+        smart_contract_address=BEP20_CONTRACT,
+    )
+
+
+async def tron_balance(url: str):
+    service = Tron("", "", "", endpoint_uri=url, api_key="benchmark")
+    return service, lambda index: service.get_balance(TRON_RECIPIENT)
+
+
+async def tron_send(url: str):
+    service = Tron("", "", "", endpoint_uri=url, api_key="benchmark")
+    wallet = {"private_key": "11" * 32}
+    return service, lambda index: service.send(TRON_RECIPIENT, 1, wallet)
+
+
+SCENARIOS = {
+    "btc_balance": Scenario(BitcoindMock, btc_balance),
+    "btc_send": Scenario(BitcoindMock, btc_send),
+    "btc_send_batched": Scenario(BitcoindMock, btc_send_batched),
+    "btc_sum_and_address": Scenario(BitcoindMock, btc_sum_and_address),
+    "btc_confs_many": Scenario(BitcoindMock, btc_confs_many),
+    "btc_scan_block": Scenario(BitcoindMock, btc_scan_block),
+    "btc_stream_block": Scenario(BitcoindMock, btc_stream_block),
+    "doge_send": Scenario(DogecoindMock, doge_send),
+    "doge_sum_and_address": Scenario(DogecoindMock, doge_sum_and_address),
+    "eth_balance": Scenario(EvmNodeMock, eth_balance),
+    "eth_send": Scenario(EvmNodeMock, eth_send),
+    "eth_confs": Scenario(EvmNodeMock, eth_confs),
+    "bnb_token_send": Scenario(EvmNodeMock, bnb_token_send),
+    "tron_balance": Scenario(TronGridMock, tron_balance),
+    "tron_send": Scenario(TronGridMock, tron_send),
+}
@@ -1,10 +1,36 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from typing import Awaitable, Callable
+
 from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
 
 from web3 import AsyncWeb3
 
 from ..providers.btc_provider import BitcoinRPCProvider
+from ..providers.metrics import RPCMetrics, instrument_provider
+from ..providers.node_pool import NodePool
+from ..providers.rpc_transcript import attach_transport
+from ..providers.payout_batcher import PayoutResult
+from ..providers.sweeper import SweepResult
+from .bep20 import decode_uint256, encode_balance_of
+from .crypto_executor import CryptoExecutor, generate_evm_account, sign_evm_transaction
 from .custom_exceptions import OnNodeWalletCreationError, GetTransactionError
-from ..providers.eth_provider import EtherProvider
+from .custom_types import IncrementalIncomeRepository, PoolEntry, ScanCheckpoint
+from .fee_oracle import FeeOracle
+from .head_tracker import ChainHeadTracker
+from .multicall import (
+    MULTICALL3_ADDRESS,
+    decode_aggregate3,
+    encode_aggregate3,
+    encode_get_eth_balance,
+)
+from .nonce_manager import NonceManager, is_nonce_error
+from .recipient_cache import RecipientCache
+from ..providers.eth_provider import EtherProvider, PooledHTTPProvider
 
 
 class BitcoinLikeChainsService:
@@ -12,9 +38,21 @@ class BitcoinLikeChainsService:
         self,
         rpcuser: str,
         rpcpassword: str,
-        rpcaddress: str,
+        rpcaddress: str | list[str] | NodePool,
+        **provider_options,
     ):
-        self.provider = BitcoinRPCProvider(rpcuser, rpcpassword, rpcaddress)
+        self.provider = BitcoinRPCProvider(
+            rpcuser, rpcpassword, rpcaddress, **provider_options
+        )
+
+    async def close(self):
+        await self.provider.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     async def create_wallet(self, tag: str) -> str:
         resp = await self.provider.create_wallet(tag)
@@ -26,6 +64,18 @@ class BitcoinLikeChainsService:
         await self.provider.unload_wallet_by_tag(tag)
         return address
 
+    def derive_address(self, index: int, change: int = 0) -> str:
+        return self.provider.derive_address(index, change)
+
+    async def create_watch_only_wallet(
+        self, tag: str = "watch", range_end: int = 1000
+    ) -> list[dict]:
+        return await self.provider.create_watch_only_wallet(tag, range_end)
+
+    async def new_pool_entry(self) -> PoolEntry:
+        tag = f"pool_{uuid.uuid4().hex}"
+        return PoolEntry(tag, await self.create_wallet(tag))
+
     @classmethod
     async def satoshi_to_btc(self, amwount: int):
         return int(amwount) / 100000000
@@ -36,15 +86,26 @@ class BitcoinLikeChainsService:
     async def get_balance(self, wallet):
         return await self.provider.get_balance_from_node(wallet)
 
+    async def get_balances(self, wallets: list[str]) -> dict[str, int | None]:
+        return await self.provider.get_balance_from_node_many(wallets)
+
     async def transfer_to_main(
         self, main_address: str, transit_tag: str, amount: float
     ) -> dict:
         resp = await self.provider.send_from_tag(main_address, transit_tag, amount)
         return resp
 
+    async def sweep_to_main(
+        self, main_address: str, transit_tags: list[str], max_inputs: int = 500
+    ) -> list[SweepResult]:
+        return await self.provider.sweep_tags(transit_tags, main_address, max_inputs)
+
     async def send(self, wallet: str, amount: float) -> str:
         return await self.provider.send_from_base_wallet(wallet, amount)
 
+    async def send_batched(self, wallet: str, amount: float) -> PayoutResult:
+        return await self.provider.payouts.submit(wallet, amount)
+
     async def get_sum_and_address(self, tag: str, transaction_id: str) -> dict:
         data = await self.provider.get_tag_transaction(tag, transaction_id)
         data = data.get("result")
@@ -65,6 +126,7 @@ class BitcoinLikeChainsService:
         return resp
 
     async def unload_wallet(self, wallet: str) -> dict:
+        self.provider.wallets.discard(wallet)
         resp = await self.provider.unload_wallet_by_tag(wallet)
         return resp
 
@@ -75,27 +137,188 @@ class BitcoinLikeChainsService:
             raise GetTransactionError(resp.get("error"))
         return confs
 
+    async def get_confs_many(self, txids: list[str]) -> dict[str, int | None]:
+        return await self.provider.get_confs_from_index(txids)
+
     async def get_unspent_wallet_data(self, tag: str, repository):
-        await self.load_wallet(tag)
-        txid = await self.provider.list_transactions_last(tag, repository)
-        await self.unload_wallet(tag)
+        async with self.provider.wallets.hold(tag):
+            txid = await self.provider.list_transactions_last(tag, repository)
         return {"txid": txid, "tag": tag}
 
+    def scan_blocks(
+        self,
+        start_height: int | None = None,
+        end_height: int | None = None,
+        prefetch: int = 8,
+        checkpoint: ScanCheckpoint | None = None,
+    ):
+        return self.provider.scan_blocks(
+            start_height, end_height, prefetch=prefetch, checkpoint=checkpoint
+        )
+
+    def iter_block_transactions(self, height: int):
+        return self.provider.iter_block_transactions(height)
+
+    def iter_wallet_transactions(self, tag: str, count: int = 10, skip: int = 0):
+        return self.provider.iter_wallet_transactions(tag, count, skip)
+
+    async def get_new_incomes(
+        self, tag: str, repository: IncrementalIncomeRepository
+    ) -> tuple[list[dict], str]:
+        cursor = await repository.get_cursor(tag)
+        async with self.provider.wallets.hold(tag):
+            transactions, lastblock = await self.provider.list_incoming_since(
+                tag, cursor
+            )
+        txids = list({transaction["txid"] for transaction in transactions})
+        existing = await repository.incomes_existing(txids) if txids else set()
+        incomes = [
+            transaction
+            for transaction in transactions
+            if transaction["txid"] not in existing
+        ]
+        return incomes, lastblock
+
 
 class EtherLikeService:
-    def __init__(self, rpcuser: str, rpcpassword: str, rpcaddress: str):
+    nonce_retries = 3
+    multicall_address = MULTICALL3_ADDRESS
+    multicall_concurrency = 4
+    finality_depth = 64
+
+    def __init__(
+        self,
+        rpcuser: str,
+        rpcpassword: str,
+        rpcaddress: str | list[str] | NodePool,
+        recipient_cache_path: str | None = None,
+        crypto_executor: str = "thread",
+        crypto_workers: int | None = None,
+        metrics: RPCMetrics | None = None,
+        transport=None,
+    ):
         self.provider = EtherProvider(
-            rpcaddress=rpcaddress, rpcpassword=rpcpassword, rpcuser=rpcuser
+            rpcaddress=rpcaddress,
+            rpcpassword=rpcpassword,
+            rpcuser=rpcuser,
+            rpcversion="2.0",
+            metrics=metrics,
+            transport=transport,
         )
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpcaddress))
+        if self.provider.nodes is None:
+            self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpcaddress))
+        else:
+            self.w3 = AsyncWeb3(PooledHTTPProvider(self.provider.nodes))
+        if transport is not None:
+            attach_transport(self.w3.provider, transport)
+        if metrics is not None:
+            instrument_provider(self.w3.provider, metrics)
+        self.metrics = metrics
+        self.heads = ChainHeadTracker(self.w3)
+        self.nonces = NonceManager(self.w3)
+        self.fees = FeeOracle(self.w3)
+        self.heads.add_listener(self.fees.invalidate)
+        self.recipients = RecipientCache(self.w3, path=recipient_cache_path)
+        self.crypto = CryptoExecutor(crypto_executor, max_workers=crypto_workers)
+        self._tx_blocks: OrderedDict[str, int] = OrderedDict()
+        self._tx_blocks_size = 100_000
+
+    async def close(self):
+        await self.heads.close()
+        await self.recipients.close()
+        await self.crypto.close()
+        await self.provider.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     def create_wallet(self, tag: str) -> LocalAccount:
         return self.w3.eth.account.create()
 
+    async def create_wallets(self, count: int) -> list[dict]:
+        return await self.crypto.map(generate_evm_account, [()] * count)
+
+    async def new_pool_entry(self) -> PoolEntry:
+        account = await self.crypto.run(generate_evm_account)
+        return PoolEntry(account["address"], account["address"], account["private_key"])
+
+    async def sign_transactions(
+        self, transactions: list[tuple[dict, str | bytes]]
+    ) -> list[bytes]:
+        return await self.crypto.map(sign_evm_transaction, transactions)
+
     async def balance(self, account: str) -> float:
         balance = await self.w3.eth.get_balance(account)
         return self.w3.from_wei(balance, "ether")
 
+    async def balances(
+        self, accounts: list[str], chunk_size: int = 500
+    ) -> dict[str, Decimal | None]:
+        if await self.recipients.is_contract(self.multicall_address):
+            values = await self._multicall(
+                [
+                    (self.multicall_address, encode_get_eth_balance(account))
+                    for account in accounts
+                ],
+                chunk_size,
+            )
+        else:
+            values = await self._batch_values(
+                [("eth_getBalance", [account, "latest"]) for account in accounts]
+            )
+        return {
+            account: None if value is None else self.w3.from_wei(value, "ether")
+            for account, value in zip(accounts, values)
+        }
+
+    async def token_balances(
+        self, accounts: list[str], token_address: str, chunk_size: int = 500
+    ) -> dict[str, int | None]:
+        calls = [(token_address, encode_balance_of(account)) for account in accounts]
+        if await self.recipients.is_contract(self.multicall_address):
+            values = await self._multicall(calls, chunk_size)
+        else:
+            values = await self._batch_values(
+                [
+                    ("eth_call", [{"to": target, "data": "0x" + data.hex()}, "latest"])
+                    for target, data in calls
+                ]
+            )
+        return dict(zip(accounts, values))
+
+    async def _multicall(
+        self, calls: list[tuple[str, bytes]], chunk_size: int
+    ) -> list[int | None]:
+        semaphore = asyncio.Semaphore(self.multicall_concurrency)
+
+        async def aggregate(chunk):
+            async with semaphore:
+                result = await self.w3.eth.call(
+                    {"to": self.multicall_address, "data": encode_aggregate3(chunk)}
+                )
+            return [
+                decode_uint256(data) if success and len(data) >= 32 else None
+                for success, data in decode_aggregate3(result)
+            ]
+
+        chunks = await asyncio.gather(
+            *(
+                aggregate(calls[start : start + chunk_size])
+                for start in range(0, len(calls), chunk_size)
+            )
+        )
+        return [value for chunk in chunks for value in chunk]
+
+    async def _batch_values(self, calls: list[tuple[str, list]]) -> list[int | None]:
+        responses = await self.provider._send_batch(calls)
+        return [
+            int(resp["result"], 16) if resp.get("result") not in (None, "0x") else None
+            for resp in responses
+        ]
+
     async def send(
         self, address: str, amount: float | str, sender_public: str, sender_private: str
     ) -> str:
@@ -103,33 +326,60 @@ class EtherLikeService:
             address = address
         else:
             address = address.address
-        nonce = await self.w3.eth.get_transaction_count(sender_public)
-        gas_price = await self.w3.eth.gas_price
-        gas = await self.w3.eth.estimate_gas(
-            {
-                "to": address,
-                "from": sender_public,
-                "value": self.w3.to_wei(amount, "ether"),
-            }
-        )
-        signed_txn = self.w3.eth.account.sign_transaction(
-            dict(
-                nonce=nonce + 1,
-                maxFeePerGas=gas_price,
-                maxPriorityFeePerGas=3000000000,
+        fees = await self.fees.eip1559()
+        if await self.recipients.is_contract(address):
+            gas = await self.w3.eth.estimate_gas(
+                {
+                    "to": address,
+                    "from": sender_public,
+                    "value": self.w3.to_wei(amount, "ether"),
+                }
+            )
+        else:
+            gas = 21000
+
+        async def build_transaction(nonce: int) -> dict:
+            return dict(
+                nonce=nonce,
+                maxFeePerGas=fees["maxFeePerGas"],
+                maxPriorityFeePerGas=fees["maxPriorityFeePerGas"],
                 gas=gas,
                 to=address,
                 value=self.w3.to_wei(amount, "ether"),
                 data=b"",
                 type=2,
                 chainId=1,
-            ),
-            sender_private,
+            )
+
+        result = await self._send_with_nonce(
+            sender_public, sender_private, build_transaction
         )
-        result = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         txid = "0x" + result.hex()
         return txid
 
+    async def _send_with_nonce(
+        self,
+        sender: str,
+        private_key: str,
+        build_transaction: Callable[[int], Awaitable[dict]],
+    ) -> HexBytes:
+        attempt = 0
+        while True:
+            try:
+                nonce = await self.nonces.next_nonce(sender)
+                raw_transaction = await self.crypto.run(
+                    sign_evm_transaction, await build_transaction(nonce), private_key
+                )
+                return await self.w3.eth.send_raw_transaction(raw_transaction)
+            except Exception as exc:
+                if not is_nonce_error(exc) or attempt >= self.nonce_retries:
+                    self.nonces.reset(sender)
+                    raise
+            attempt += 1
+            if self.metrics is not None:
+                self.metrics.retried("eth_sendRawTransaction")
+            await self.nonces.resync(sender)
+
     async def transfer_to_main(self, main_address, wallet, amount):
         try:
             await self.send(
@@ -139,19 +389,29 @@ class EtherLikeService:
             await self.send(main_address, amount, wallet.address, wallet.private_key)
 
     async def get_confs(self, txid: str):
-        try:
-            transaction = await self.w3.eth.get_transaction(txid)
-        except Exception:
-            return -1
+        block_number = self._tx_blocks.get(txid)
+        if block_number is not None:
+            self._tx_blocks.move_to_end(txid)
+        else:
+            try:
+                transaction = await self.w3.eth.get_transaction(txid)
+            except Exception:
+                return -1
 
-        if transaction is None:
-            return -1
+            if transaction is None or transaction["blockNumber"] is None:
+                return -1
+
+            block_number = transaction["blockNumber"]
 
         try:
-            latest_block_number = await self.w3.eth.block_number
+            latest_block_number = await self.heads.get_head()
         except Exception:
             return -1
 
-        confirmation_count = latest_block_number - transaction["blockNumber"]
+        confirmation_count = latest_block_number - block_number
+        if confirmation_count >= self.finality_depth and txid not in self._tx_blocks:
+            self._tx_blocks[txid] = block_number
+            if len(self._tx_blocks) > self._tx_blocks_size:
+                self._tx_blocks.popitem(last=False)
 
         return confirmation_count
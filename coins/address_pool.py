@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Awaitable, Callable
+
+from .custom_types import PoolEntry
+
+
+class AddressPool:
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[PoolEntry]],
+        low_watermark: int = 100,
+        high_watermark: int = 500,
+        path: str | None = None,
+        concurrency: int = 4,
+        encrypt_key: Callable[[str], str] | None = None,
+        decrypt_key: Callable[[str], str] | None = None,
+    ):
+        if low_watermark > high_watermark:
+            raise ValueError("low_watermark must not exceed high_watermark")
+        self.factory = factory
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.path = path
+        self.concurrency = concurrency
+        self.encrypt_key = encrypt_key
+        self.decrypt_key = decrypt_key
+        self._entries: deque[PoolEntry] = deque()
+        self._refill: asyncio.Task | None = None
+        self._log = None
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def start(self):
+        if len(self._entries) < self.low_watermark:
+            self._schedule_refill()
+
+    async def acquire(self) -> PoolEntry:
+        if self._entries:
+            entry = self._entries.popleft()
+            self._write({"take": entry.tag})
+        else:
+            entry = await self.factory()
+        if len(self._entries) < self.low_watermark:
+            self._schedule_refill()
+        return entry
+
+    async def close(self):
+        refill, self._refill = self._refill, None
+        if refill is not None:
+            refill.cancel()
+            try:
+                await refill
+            except asyncio.CancelledError:
+                pass
+        if self.path:
+            await asyncio.to_thread(self._compact)
+
+    def _schedule_refill(self):
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.ensure_future(self._fill())
+
+    async def _fill(self):
+        while len(self._entries) < self.high_watermark:
+            count = min(self.concurrency, self.high_watermark - len(self._entries))
+            results = await asyncio.gather(
+                *(self.factory() for _ in range(count)), return_exceptions=True
+            )
+            entries = [entry for entry in results if isinstance(entry, PoolEntry)]
+            for entry in entries:
+                self._entries.append(entry)
+                record = self._record(entry)
+                if record is not None:
+                    self._write({"add": record})
+            if len(entries) < count:
+                return
+
+    def _record(self, entry: PoolEntry) -> dict | None:
+        record = entry._asdict()
+        if entry.private_key is not None:
+            if self.encrypt_key is None:
+                return None
+            record["private_key"] = self.encrypt_key(entry.private_key)
+        return record
+
+    def _write(self, record: dict):
+        if not self.path:
+            return
+        if self._log is None:
+            self._log = _open_private(self.path, os.O_APPEND)
+        self._log.write(json.dumps(record) + "\n")
+        self._log.flush()
+
+    def _load(self):
+        entries: dict[str, PoolEntry] = {}
+        with open(self.path) as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "add" in record:
+                    entry = PoolEntry(**record["add"])
+                    if entry.private_key is not None:
+                        if self.decrypt_key is None:
+                            raise ValueError("decrypt_key is required to load keys")
+                        entry = entry._replace(
+                            private_key=self.decrypt_key(entry.private_key)
+                        )
+                    entries[entry.tag] = entry
+                else:
+                    entries.pop(record["take"], None)
+        self._entries.extend(entries.values())
+
+    def _compact(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp_path = f"{self.path}.tmp"
+        with _open_private(tmp_path, os.O_TRUNC) as file:
+            for entry in self._entries:
+                record = self._record(entry)
+                if record is not None:
+                    file.write(json.dumps({"add": record}) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+def _open_private(path: str, flags: int):
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | flags, 0o600), "w")
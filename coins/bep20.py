@@ -0,0 +1,30 @@
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")
+APPROVE_SELECTOR = bytes.fromhex("095ea7b3")
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+
+def encode_address(address: str) -> bytes:
+    raw = bytes.fromhex(address[2:] if address[:2].lower() == "0x" else address)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address {address}")
+    return raw.rjust(32, b"\0")
+
+
+def encode_uint256(value: int) -> bytes:
+    return int(value).to_bytes(32, "big")
+
+
+def decode_uint256(data: bytes) -> int:
+    return int.from_bytes(data[:32], "big")
+
+
+def encode_transfer(recipient: str, amount: int) -> bytes:
+    return TRANSFER_SELECTOR + encode_address(recipient) + encode_uint256(amount)
+
+
+def encode_approve(spender: str, amount: int) -> bytes:
+    return APPROVE_SELECTOR + encode_address(spender) + encode_uint256(amount)
+
+
+def encode_balance_of(owner: str) -> bytes:
+    return BALANCE_OF_SELECTOR + encode_address(owner)
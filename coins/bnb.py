@@ -1,35 +1,49 @@
 import web3
+from web3.contract import AsyncContract
 
 from .abstract_coins import EtherLikeService
+from .bep20 import decode_uint256, encode_approve, encode_balance_of, encode_transfer
 from .bep20abi import abi_list
 
 
 class BinanceCoin(EtherLikeService):
+    token_gas_limit = 100_000
+    finality_depth = 15
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._contracts: dict[str, AsyncContract] = {}
+
+    def get_contract(self, smart_contract_address: str) -> AsyncContract:
+        contract = self._contracts.get(smart_contract_address)
+        if contract is None:
+            contract = self._contracts[smart_contract_address] = self.w3.eth.contract(
+                address=smart_contract_address, abi=abi_list
+            )
+        return contract
+
     async def _send_via_contract(
         self,
         account,
         smart_contract_address,
-        recipient_address,
-        amount_in_wei,
+        data,
         gas_limit,
         gas_price,
-        nonce,
     ):
-        contract = self.w3.eth.contract(address=smart_contract_address, abi=abi_list)
-
-        transaction = await contract.functions.transfer(
-            recipient_address, amount_in_wei
-        ).build_transaction(
-            {
+        async def build_transaction(nonce: int) -> dict:
+            return {
+                "to": smart_contract_address,
+                "value": 0,
+                "data": data,
                 "gas": gas_limit,
                 "gasPrice": gas_price,
                 "nonce": nonce,
                 "chainId": 56,
             }
-        )
 
-        signed_txn = account.sign_transaction(transaction)
-        txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        txn_hash = await self._send_with_nonce(
+            account.address, account.key, build_transaction
+        )
 
         return txn_hash.hex()
 
@@ -48,28 +62,54 @@ class BinanceCoin(EtherLikeService):
         account = self.w3.eth.account.from_key(private_key)
         recipient_address = web3.Web3.to_checksum_address(address)
         amount_in_wei = self.w3.to_wei(amount, "ether")
-        gas_price = await self.w3.eth.gas_price
-        nonce = await self.w3.eth.get_transaction_count(account.address)
+        gas_price = (await self.fees.legacy())["gasPrice"]
         gas_limit = 21000
-        smart_contract_address = web3.Web3.to_checksum_address(smart_contract_address)
         if smart_contract_address:
             return await self._send_via_contract(
                 account,
-                smart_contract_address,
-                recipient_address,
-                amount_in_wei,
-                gas_limit,
+                web3.Web3.to_checksum_address(smart_contract_address),
+                encode_transfer(recipient_address, amount_in_wei),
+                self.token_gas_limit,
                 gas_price,
-                nonce,
             )
-        transaction = {
-            "to": recipient_address,
-            "value": amount_in_wei,
-            "gas": gas_limit,
-            "gasPrice": gas_price,
-            "nonce": nonce,
-            "chainId": 56,
-        }
-        signed_txn = account.sign_transaction(transaction)
-        txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+
+        async def build_transaction(nonce: int) -> dict:
+            return {
+                "to": recipient_address,
+                "value": amount_in_wei,
+                "gas": gas_limit,
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": 56,
+            }
+
+        txn_hash = await self._send_with_nonce(
+            account.address, account.key, build_transaction
+        )
         return txn_hash.hex()
+
+    async def approve(
+        self,
+        spender: str,
+        amount: float | str,
+        private_key: str,
+        smart_contract_address: str,
+    ) -> str:
+        account = self.w3.eth.account.from_key(private_key)
+        gas_price = (await self.fees.legacy())["gasPrice"]
+        return await self._send_via_contract(
+            account,
+            web3.Web3.to_checksum_address(smart_contract_address),
+            encode_approve(spender, self.w3.to_wei(amount, "ether")),
+            self.token_gas_limit,
+            gas_price,
+        )
+
+    async def token_balance(self, address: str, smart_contract_address: str) -> int:
+        result = await self.w3.eth.call(
+            {
+                "to": web3.Web3.to_checksum_address(smart_contract_address),
+                "data": encode_balance_of(address),
+            }
+        )
+        return decode_uint256(result)
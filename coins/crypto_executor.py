@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+from eth_account import Account
+from tronpy.keys import PrivateKey
+
+
+def generate_evm_account() -> dict:
+    account = Account.create()
+    return {"address": account.address, "private_key": account.key.hex()}
+
+
+def sign_evm_transaction(transaction: dict, private_key: str | bytes) -> bytes:
+    return bytes(Account.sign_transaction(transaction, private_key).rawTransaction)
+
+
+def generate_tron_address() -> dict:
+    private_key = PrivateKey.random()
+    return {
+        "base58check_address": private_key.public_key.to_base58check_address(),
+        "hex_address": private_key.public_key.to_hex_address(),
+        "private_key": private_key.hex(),
+        "public_key": private_key.public_key.hex(),
+    }
+
+
+def tron_address(private_key: str) -> str:
+    return PrivateKey(bytes.fromhex(private_key)).public_key.to_base58check_address()
+
+
+def sign_tron_txid(txid: str, private_key: str) -> str:
+    return (
+        PrivateKey(bytes.fromhex(private_key)).sign_msg_hash(bytes.fromhex(txid)).hex()
+    )
+
+
+def sign_tron_transaction(transaction, private_key: str):
+    return transaction.sign(PrivateKey(bytes.fromhex(private_key)))
+
+
+def _call_many(function: Callable, arguments: list[tuple]) -> list:
+    return [function(*args) for args in arguments]
+
+
+class CryptoExecutor:
+    def __init__(
+        self, kind: str = "thread", max_workers: int | None = None, chunk_size: int = 64
+    ):
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown executor kind {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+        return self._executor
+
+    async def run(self, function: Callable, *args):
+        if self.kind == "inline":
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), function, *args
+        )
+
+    async def map(self, function: Callable, arguments: Iterable[tuple]) -> list:
+        arguments = list(arguments)
+        chunks = await asyncio.gather(
+            *(
+                self.run(
+                    _call_many, function, arguments[start : start + self.chunk_size]
+                )
+                for start in range(0, len(arguments), self.chunk_size)
+            )
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    async def close(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown)
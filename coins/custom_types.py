@@ -1,7 +1,37 @@
-from typing import NamedTuple
+from typing import NamedTuple, Protocol
 
 
 class BitcoinAccount(NamedTuple):
     public_key: str
     private_key: str
     address: str
+
+
+class PoolEntry(NamedTuple):
+    tag: str
+    address: str
+    private_key: str | None = None
+
+
+class IncomeRepository(Protocol):
+    async def income_exists(self, txid: str) -> bool:
+        ...
+
+
+class IncrementalIncomeRepository(Protocol):
+    async def incomes_existing(self, txids: list[str]) -> set[str]:
+        ...
+
+    async def get_cursor(self, tag: str) -> str | None:
+        ...
+
+    async def set_cursor(self, tag: str, blockhash: str) -> None:
+        ...
+
+
+class ScanCheckpoint(Protocol):
+    async def get_height(self) -> int | None:
+        ...
+
+    async def set_height(self, height: int) -> None:
+        ...
@@ -1,4 +1,5 @@
 from .abstract_coins import BitcoinLikeChainsService
+from ..providers.node_pool import NodePool
 from ..providers.doge_provider import DogeRPCProvider
 from .custom_exceptions import TransferToMainError
 
@@ -8,10 +9,11 @@ class Doge(BitcoinLikeChainsService):
         self,
         rpcuser: str,
         rpcpassword: str,
-        rpcaddress: str,
+        rpcaddress: str | list[str] | NodePool,
+        **provider_options,
     ):
         self.provider = DogeRPCProvider(
-            rpcuser, rpcpassword, rpcaddress, rpcversion="2.0"
+            rpcuser, rpcpassword, rpcaddress, rpcversion="2.0", **provider_options
         )
 
     async def get_sum_and_address(self, tag: str, transaction_id: str):
@@ -0,0 +1,70 @@
+import asyncio
+from time import monotonic
+from typing import Awaitable, Callable
+
+from web3 import AsyncWeb3
+
+
+SPEEDS = {"slow": 0, "medium": 1, "fast": 2}
+
+
+class FeeOracle:
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        ttl: float = 3.0,
+        block_count: int = 10,
+        percentiles: tuple[int, int, int] = (10, 50, 90),
+        min_priority_fee: int = 100_000_000,
+    ):
+        self.w3 = w3
+        self.ttl = ttl
+        self.block_count = block_count
+        self.percentiles = percentiles
+        self.min_priority_fee = min_priority_fee
+        self._values: dict[str, tuple[object, float]] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def invalidate(self, *_):
+        self._values.clear()
+
+    async def eip1559(self, speed: str = "medium") -> dict:
+        base_fee, priority_fees = await self._get("history", self._fetch_history)
+        priority_fee = priority_fees[SPEEDS[speed]]
+        return {
+            "maxFeePerGas": 2 * base_fee + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+
+    async def legacy(self) -> dict:
+        return {"gasPrice": await self._get("gas_price", self._fetch_gas_price)}
+
+    async def _get(self, name: str, fetch: Callable[[], Awaitable]):
+        cached = self._values.get(name)
+        if cached is not None and cached[1] > monotonic():
+            return cached[0]
+        task = self._refreshing.get(name)
+        if task is None or task.done():
+            task = self._refreshing[name] = asyncio.ensure_future(
+                self._refresh(name, fetch)
+            )
+        return await asyncio.shield(task)
+
+    async def _refresh(self, name: str, fetch: Callable[[], Awaitable]):
+        value = await fetch()
+        self._values[name] = (value, monotonic() + self.ttl)
+        return value
+
+    async def _fetch_history(self) -> tuple[int, list[int]]:
+        history = await self.w3.eth.fee_history(
+            self.block_count, "latest", list(self.percentiles)
+        )
+        rewards = history.get("reward") or []
+        priority_fees = []
+        for index in range(len(self.percentiles)):
+            values = sorted(block[index] for block in rewards) or [0]
+            priority_fees.append(max(values[len(values) // 2], self.min_priority_fee))
+        return history["baseFeePerGas"][-1], priority_fees
+
+    async def _fetch_gas_price(self) -> int:
+        return await self.w3.eth.gas_price
@@ -0,0 +1,61 @@
+import asyncio
+from time import monotonic
+from typing import Callable
+
+from web3 import AsyncWeb3
+
+
+class ChainHeadTracker:
+    def __init__(
+        self, w3: AsyncWeb3, poll_interval: float = 2.0, idle_timeout: float = 60.0
+    ):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.head: int | None = None
+        self._listeners: list[Callable[[int], None]] = []
+        self._last_read = 0.0
+        self._updating: asyncio.Task | None = None
+        self._poller: asyncio.Task | None = None
+
+    def add_listener(self, listener: Callable[[int], None]):
+        self._listeners.append(listener)
+
+    def update(self, head: int):
+        if head == self.head:
+            return
+        self.head = head
+        for listener in self._listeners:
+            listener(head)
+
+    async def get_head(self) -> int:
+        self._last_read = monotonic()
+        if self.head is None:
+            await self._refresh()
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+        return self.head
+
+    async def close(self):
+        for task in (self._poller, self._updating):
+            if task is not None and not task.done():
+                task.cancel()
+        self._poller = self._updating = None
+
+    async def _refresh(self):
+        if self._updating is None or self._updating.done():
+            self._updating = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._updating)
+
+    async def _fetch(self):
+        self.update(await self.w3.eth.block_number)
+
+    async def _poll(self):
+        try:
+            while monotonic() - self._last_read < self.idle_timeout:
+                await asyncio.sleep(self.poll_interval)
+                await self._refresh()
+        except Exception:
+            return
+        finally:
+            self.head = None
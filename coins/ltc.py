@@ -1,4 +1,5 @@
 from .abstract_coins import BitcoinLikeChainsService
+from ..providers.node_pool import NodePool
 from ..providers.ltc_provider import LtcRPCProvider
 
 
@@ -7,6 +8,9 @@ class Litecoin(BitcoinLikeChainsService):
         self,
         rpcuser: str,
         rpcpassword: str,
-        rpcaddress: str,
+        rpcaddress: str | list[str] | NodePool,
+        **provider_options,
     ):
-        self.provider = LtcRPCProvider(rpcuser, rpcpassword, rpcaddress)
+        self.provider = LtcRPCProvider(
+            rpcuser, rpcpassword, rpcaddress, **provider_options
+        )
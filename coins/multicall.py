@@ -0,0 +1,24 @@
+from eth_abi import decode, encode
+
+from .bep20 import encode_address
+
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex("4d2301cc")
+
+
+def encode_aggregate3(calls: list[tuple[str, bytes]]) -> bytes:
+    return AGGREGATE3_SELECTOR + encode(
+        ["(address,bool,bytes)[]"],
+        [[(target, True, data) for target, data in calls]],
+    )
+
+
+def decode_aggregate3(data: bytes) -> list[tuple[bool, bytes]]:
+    (results,) = decode(["(bool,bytes)[]"], data)
+    return results
+
+
+def encode_get_eth_balance(address: str) -> bytes:
+    return GET_ETH_BALANCE_SELECTOR + encode_address(address)
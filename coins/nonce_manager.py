@@ -0,0 +1,47 @@
+import asyncio
+
+from web3 import AsyncWeb3
+
+
+NONCE_ERRORS = (
+    "nonce too low",
+    "replacement transaction underpriced",
+    "replacement underpriced",
+)
+
+
+def is_nonce_error(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return any(error in message for error in NONCE_ERRORS)
+
+
+class NonceManager:
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self._nonces: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def next_nonce(self, address: str) -> int:
+        key = address.lower()
+        async with self._lock(key):
+            nonce = self._nonces.get(key)
+            if nonce is None:
+                nonce = await self.w3.eth.get_transaction_count(address, "pending")
+            self._nonces[key] = nonce + 1
+            return nonce
+
+    async def resync(self, address: str):
+        key = address.lower()
+        async with self._lock(key):
+            self._nonces[key] = await self.w3.eth.get_transaction_count(
+                address, "pending"
+            )
+
+    def reset(self, address: str):
+        self._nonces.pop(address.lower(), None)
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
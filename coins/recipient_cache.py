@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from math import inf
+from time import time
+
+from web3 import AsyncWeb3
+
+
+class RecipientCache:
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        max_size: int = 100_000,
+        path: str | None = None,
+        eoa_ttl: float = 600.0,
+    ):
+        self.w3 = w3
+        self.max_size = max_size
+        self.path = path
+        self.eoa_ttl = eoa_ttl
+        self._kinds: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+        if path and os.path.exists(path):
+            self._load()
+
+    async def is_contract(self, address: str) -> bool:
+        key = address.lower()
+        kind = self._kinds.get(key)
+        if kind is not None and kind[1] > time():
+            self._kinds.move_to_end(key)
+            return kind[0]
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.ensure_future(
+                self._classify(address, key)
+            )
+        return await asyncio.shield(future)
+
+    async def close(self):
+        if self.path:
+            await asyncio.to_thread(self._save)
+
+    async def _classify(self, address: str, key: str) -> bool:
+        try:
+            code = await self.w3.eth.get_code(address)
+        finally:
+            self._pending.pop(key, None)
+        is_contract = len(code) > 0
+        self._remember(key, is_contract, inf if is_contract else time() + self.eoa_ttl)
+        return is_contract
+
+    def _remember(self, key: str, is_contract: bool, expires: float):
+        self._kinds[key] = (is_contract, expires)
+        self._kinds.move_to_end(key)
+        while len(self._kinds) > self.max_size:
+            self._kinds.popitem(last=False)
+
+    def _load(self):
+        now = time()
+        with open(self.path) as file:
+            for key, kind in json.load(file).items():
+                if isinstance(kind, bool):
+                    kind = [kind, None if kind else now]
+                is_contract, expires = kind
+                expires = inf if expires is None else expires
+                if expires > now:
+                    self._remember(key, is_contract, expires)
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        kinds = {
+            key: [is_contract, None if expires == inf else expires]
+            for key, (is_contract, expires) in self._kinds.items()
+        }
+        with open(tmp_path, "w") as file:
+            json.dump(kinds, file)
+        os.replace(tmp_path, self.path)
@@ -1,49 +1,128 @@
-from tronpy.keys import PrivateKey
-from tronpy import Tron as TronNetwork
-from tronpy.providers import HTTPProvider
-from hexbytes import HexBytes
-import os
+import asyncio
 
+from tronpy.async_tron import AsyncTransaction, AsyncTransactionRet
+from tronpy.exceptions import BadKey
+from tronpy.keys import to_hex_address
 
+
+from .crypto_executor import (
+    CryptoExecutor,
+    generate_tron_address,
+    sign_tron_transaction,
+    sign_tron_txid,
+    tron_address,
+)
 from .custom_exceptions import TronTransferError
-from ..providers.tron_provider import TronProvider
+from .custom_types import PoolEntry
+from ..providers.tron_provider import TronProvider, USDT_CONTRACT
+
+
+USDT_ABI = [
+    {
+        "outputs": [{"type": "bool"}],
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "transfer",
+        "stateMutability": "Nonpayable",
+        "type": "Function",
+    }
+]
 
 
 class Tron:
-    def __init__(self, rpcuser: str, rpcpassword: str, rpcaddress: str):
+    def __init__(
+        self,
+        rpcuser: str,
+        rpcpassword: str,
+        rpcaddress: str,
+        broadcast_concurrency: int = 16,
+        crypto_executor: str = "thread",
+        crypto_workers: int | None = None,
+        **provider_options,
+    ):
         self.provider = TronProvider(
-            rpcaddress=rpcaddress, rpcpassword=rpcpassword, rpcuser=rpcuser
+            rpcaddress=rpcaddress,
+            rpcpassword=rpcpassword,
+            rpcuser=rpcuser,
+            **provider_options,
         )
-        self._tron = TronNetwork(HTTPProvider(api_key=os.environ.get("TRON_API_KEY")))
+        self.broadcast_concurrency = broadcast_concurrency
+        self.crypto = CryptoExecutor(crypto_executor, max_workers=crypto_workers)
+
+    async def close(self):
+        await self.crypto.close()
+        await self.provider.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     async def create_wallet(self, tag: str) -> dict:
         return await self.provider.create_wallet(tag)
 
+    async def create_wallets(self, count: int) -> list[dict]:
+        return await self.crypto.map(generate_tron_address, [()] * count)
+
+    async def new_pool_entry(self) -> PoolEntry:
+        wallet = await self.crypto.run(generate_tron_address)
+        return PoolEntry(
+            wallet["base58check_address"],
+            wallet["base58check_address"],
+            wallet["private_key"],
+        )
+
     async def get_balance(self, address: str) -> float:
         return await self.provider.get_base_wallet_balance(address)
 
-    async def send(self, address, amount, wallet) -> str:
-        usdt_contract = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
-        usdt_abi = [
-            {
-                "outputs": [{"type": "bool"}],
-                "inputs": [
-                    {"name": "_to", "type": "address"},
-                    {"name": "_value", "type": "uint256"},
-                ],
-                "name": "transfer",
-                "stateMutability": "Nonpayable",
-                "type": "Function",
-            }
-        ]
-        txid = await self._transfer(
+    async def get_balances(self, addresses: list[str]) -> dict[str, float]:
+        return await self.provider.get_trc20_balances(addresses)
+
+    async def send(self, address, amount, wallet, wait: bool = True) -> str:
+        broadcasted = await self._broadcast(
             wallet.get("private_key"),
             str(address),
             int(amount),
-            usdt_contract,
-            usdt_abi,
+            USDT_CONTRACT,
+            USDT_ABI,
+        )
+        if not wait:
+            return broadcasted.txid
+        return await self._wait(broadcasted)
+
+    async def send_many(
+        self, transfers: list[tuple[str, int]], wallet, wait: bool = True
+    ) -> list[str | Exception]:
+        semaphore = asyncio.Semaphore(self.broadcast_concurrency)
+
+        async def broadcast(address, amount):
+            async with semaphore:
+                return await self._broadcast(
+                    wallet.get("private_key"),
+                    str(address),
+                    int(amount),
+                    USDT_CONTRACT,
+                    USDT_ABI,
+                )
+
+        async def confirm(broadcasted):
+            if isinstance(broadcasted, Exception):
+                raise broadcasted
+            if not wait:
+                return broadcasted.txid
+            return await self._wait(broadcasted)
+
+        broadcasts = await asyncio.gather(
+            *(broadcast(address, amount) for address, amount in transfers),
+            return_exceptions=True,
+        )
+        return await asyncio.gather(
+            *(confirm(broadcasted) for broadcasted in broadcasts),
+            return_exceptions=True,
         )
-        return txid
 
     async def _transfer(
         self,
@@ -52,28 +131,60 @@ class Tron:
         amount: int,
         contract_address: str,
         abi: str = None,
-    ) -> HexBytes:
-        pk = PrivateKey(bytes.fromhex(private_key))
-
-        contract = self._tron.get_contract(contract_address)
-        contract.abi = abi
-
-        tx = (
-            contract.functions.transfer(to_address, amount * 1000000)
-            .with_owner(pk.public_key.to_base58check_address())
-            .fee_limit(1_000_000_000)
-            .build()
-            .sign(pk)
+    ) -> str:
+        broadcasted = await self._broadcast(
+            private_key, to_address, amount, contract_address, abi
         )
+        return await self._wait(broadcasted)
+
+    async def _broadcast(
+        self,
+        private_key: str,
+        to_address: str,
+        amount: int,
+        contract_address: str,
+        abi: str = None,
+    ) -> AsyncTransactionRet:
+        owner = await self.crypto.run(tron_address, private_key)
+
+        contract = await self.provider.get_contract(contract_address, abi)
+
+        builder = await contract.functions.transfer(to_address, amount * 1000000)
+        tx = await builder.with_owner(owner).fee_limit(1_000_000_000).build()
+        if self.crypto.kind == "process":
+            # The transaction cannot be sent to a process pool, so only its txid
+            # is signed there and the checks of AsyncTransaction.sign run here.
+            self._check_signer(tx, owner)
+            tx._signature.append(
+                await self.crypto.run(sign_tron_txid, tx.txid, private_key)
+            )
+        else:
+            await self.crypto.run(sign_tron_transaction, tx, private_key)
+        return await tx.broadcast()
+
+    @staticmethod
+    def _check_signer(tx: AsyncTransaction, owner: str):
+        if tx.is_expired:
+            raise TronTransferError("Transaction expired before signing")
+        if tx._permission is None:
+            return
+        address = to_hex_address(owner)
+        if all(key["address"] != address for key in tx._permission["keys"]):
+            raise BadKey(
+                "provided private key is not in the permission list",
+                f"provided {owner}",
+                f"required {tx._permission}",
+            )
 
-        broadcasted_tx = tx.broadcast().wait()
+    async def _wait(self, broadcasted: AsyncTransactionRet) -> str:
+        broadcasted_tx = await broadcasted.wait()
         if broadcasted_tx.get("result"):
             if broadcasted_tx["result"] == "FAILED":
                 raise TronTransferError(str(broadcasted_tx["resMessage"]))
         return broadcasted_tx["id"]
 
     async def get_confs(self, txid: str) -> int:
-        transaction = self._tron.get_transaction(txid)
+        transaction = await self.provider.client.get_transaction(txid)
         if transaction["ret"][0]["contractRet"] == "SUCCESS":
             return 6
         elif transaction["ret"][0]["contractRet"] == "PENDING":
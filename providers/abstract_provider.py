@@ -1,40 +1,336 @@
+import json
 import os
 from abc import ABC, abstractmethod
 import aiohttp
-from asyncio import sleep
+from aiohttp.client import DEFAULT_TIMEOUT
+from asyncio import gather
+from decimal import Decimal
+from time import perf_counter
+from typing import AsyncIterator, Callable
+
+from .block_scanner import BlockScanner
+from .hd_derivation import HDDeriver
+from .header_index import HeaderIndex
+from .json_decoder import JSONArrayStream, decode_decimal, dumps, get_decoder
+from .metrics import RPCMetrics, error_codes, payload_method
+from .node_pool import BITCOIN_READ_METHODS, EVM_READ_METHODS, Endpoint, NodePool
+from .payout_batcher import PayoutBatcher
+from .sweeper import SweepEngine, SweepResult
+from .tx_waiter import TransactionWaiter
+from .wallet_residency import WALLET_NOT_LOADED, WalletResidencyManager
 
 
 IS_DEV = os.environ.get("IS_DEV")
+WALLET_ALREADY_EXISTS = -4
 
 
 class AbstractRPCProvider(ABC):
+    tip_method = "getblockcount"
+    read_methods = BITCOIN_READ_METHODS
+
     def __init__(
-        self, rpcuser: str, rpcpassword: str, rpcaddress: str, rpcversion: str = "1.0"
+        self,
+        rpcuser: str,
+        rpcpassword: str,
+        rpcaddress: str | list[str] | NodePool,
+        rpcversion: str = "1.0",
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        request_timeout: float | None = None,
+        batch_size: int = 500,
+        metrics: RPCMetrics | None = None,
+        transport=None,
+        json_decoder: str | Callable | None = None,
+        stream_chunk_size: int = 65536,
     ):
+        if isinstance(rpcaddress, str):
+            self.nodes = None
+        else:
+            if not isinstance(rpcaddress, NodePool):
+                rpcaddress = NodePool(rpcaddress)
+            self.nodes = rpcaddress
+            if self.nodes.probe is None:
+                self.nodes.probe = self._probe
+            if self.nodes.metrics is None:
+                self.nodes.metrics = metrics
+            rpcaddress = self.nodes.primary.url
         self.rpcaddress = rpcaddress
         self.rpcuser = rpcuser
         self.rpcpassword = rpcpassword
         self.rpcversion = rpcversion
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.transport = transport
+        self.json_decoder = get_decoder(json_decoder)
+        self.stream_chunk_size = stream_chunk_size
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                auth=aiohttp.BasicAuth(login=self.rpcuser, password=self.rpcpassword),
+                timeout=(
+                    aiohttp.ClientTimeout(total=self.request_timeout, sock_connect=30)
+                    if self.request_timeout is not None
+                    else DEFAULT_TIMEOUT
+                ),
+                json_serialize=dumps,
+            )
+        return self._session
+
+    async def close(self):
+        if self.nodes is not None:
+            await self.nodes.close()
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _read_node(self, min_height: int | None = None) -> Endpoint | None:
+        if self.nodes is None:
+            return None
+        return self.nodes.select(min_height=min_height)
 
     async def _send_request(
-        self, method: str, params: str = None, wallet_tag: str = ""
+        self,
+        method: str,
+        params: str = None,
+        wallet_tag: str = "",
+        node: Endpoint | None = None,
     ):
-        if wallet_tag:
-            address = self.rpcaddress + f"/wallet/{wallet_tag}"
-        else:
-            address = self.rpcaddress
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url=address,
-                json={
-                    "id": "1",
-                    "jsonrpc": self.rpcversion,
-                    "method": method,
-                    "params": params,
+        return await self._post(
+            {
+                "id": "1",
+                "jsonrpc": self.rpcversion,
+                "method": method,
+                "params": params,
+            },
+            wallet_tag=wallet_tag,
+            node=node,
+        )
+
+    async def _send_batch(
+        self,
+        calls: list[tuple[str, list]],
+        wallet_tag: str = "",
+        node: Endpoint | None = None,
+    ) -> list[dict]:
+        chunks = await gather(
+            *(
+                self._send_batch_chunk(
+                    calls[start : start + self.batch_size], wallet_tag, node
+                )
+                for start in range(0, len(calls), self.batch_size)
+            )
+        )
+        return [response for chunk in chunks for response in chunk]
+
+    async def _send_batch_chunk(
+        self,
+        calls: list[tuple[str, list]],
+        wallet_tag: str,
+        node: Endpoint | None = None,
+    ) -> list[dict]:
+        payload = [
+            {
+                "id": str(index),
+                "jsonrpc": self.rpcversion,
+                "method": method,
+                "params": params,
+            }
+            for index, (method, params) in enumerate(calls)
+        ]
+        resp = await self._post(payload, wallet_tag=wallet_tag, node=node)
+        if not isinstance(resp, list):
+            return [resp] * len(calls)
+        by_id = {str(item.get("id")): item for item in resp}
+        return [
+            by_id.get(
+                str(index),
+                {
+                    "result": None,
+                    "error": {"code": -32603, "message": "No response for call"},
+                    "id": str(index),
                 },
-                auth=aiohttp.BasicAuth(login=self.rpcuser, password=self.rpcpassword),
-            ) as resp:
+            )
+            for index in range(len(calls))
+        ]
+
+    async def _post(
+        self, payload: dict | list, wallet_tag: str = "", node: Endpoint | None = None
+    ):
+        if self.transport is not None:
+            return await self.transport.request(
+                f"/wallet/{wallet_tag}" if wallet_tag else "/",
+                payload,
+                lambda: self._post_http(payload, wallet_tag, node),
+            )
+        return await self._post_http(payload, wallet_tag, node)
+
+    async def _post_http(
+        self, payload: dict | list, wallet_tag: str = "", node: Endpoint | None = None
+    ):
+        path = f"/wallet/{wallet_tag}" if wallet_tag else ""
+        if self.nodes is None:
+            return await self._post_to(self.rpcaddress + path, payload)
+        if node is not None:
+            async with self.nodes.track(node):
+                return await self._post_to(node.url + path, payload)
+
+        def call(url: str):
+            return self._post_to(url + path, payload)
+
+        if not wallet_tag and self._is_read(payload):
+            return await self.nodes.read(call, payload_method(payload))
+        return await self.nodes.write(call)
+
+    def _is_read(self, payload: dict | list) -> bool:
+        calls = payload if isinstance(payload, list) else [payload]
+        return all(call["method"] in self.read_methods for call in calls)
+
+    async def _probe(self, url: str) -> int:
+        payload = {
+            "id": "1",
+            "jsonrpc": self.rpcversion,
+            "method": self.tip_method,
+            "params": [],
+        }
+        async with self._get_session().post(url=url, json=payload) as resp:
+            response = await resp.json(content_type=None)
+        result = response.get("result")
+        if result is None:
+            raise ValueError(response.get("error"))
+        return int(result, 16) if isinstance(result, str) else int(result)
+
+    async def _post_to(self, address: str, payload: dict | list):
+        if self.metrics is not None:
+            return await self._post_instrumented(address, payload)
+        async with self._get_session().post(url=address, json=payload) as resp:
+            if self.json_decoder is None:
                 return await resp.json()
+            raw = await resp.read()
+        return self.json_decoder(raw)
+
+    async def _post_instrumented(self, address: str, payload: dict | list):
+        method = payload_method(payload)
+        body = dumps(payload).encode()
+        self.metrics.request_started(method)
+        started = perf_counter()
+        status = None
+        try:
+            async with self._get_session().post(
+                url=address, data=body, headers={"Content-Type": "application/json"}
+            ) as resp:
+                status = resp.status
+                raw = await resp.read()
+            response = (self.json_decoder or json.loads)(raw)
+        except Exception:
+            self.metrics.request_finished(
+                method,
+                perf_counter() - started,
+                status=status,
+                request_size=len(body),
+            )
+            raise
+        self.metrics.request_finished(
+            method,
+            perf_counter() - started,
+            status=status,
+            error_codes=error_codes(response),
+            request_size=len(body),
+            response_size=len(raw),
+        )
+        return response
+
+    async def _stream_request(
+        self,
+        method: str,
+        params: list,
+        path: tuple[str, ...] = (),
+        wallet_tag: str = "",
+        node: Endpoint | None = None,
+    ) -> AsyncIterator:
+        payload = {
+            "id": "1",
+            "jsonrpc": self.rpcversion,
+            "method": method,
+            "params": params,
+        }
+        if self.transport is not None:
+            response = await self._post(payload, wallet_tag=wallet_tag, node=node)
+            result = response.get("result")
+            for key in path:
+                result = result.get(key) if result else None
+            if result is None:
+                raise ValueError(response.get("error"))
+            for item in result:
+                yield item
+            return
+        parse_float = Decimal if self.json_decoder is decode_decimal else None
+        stream = JSONArrayStream(("result",) + tuple(path), parse_float)
+        suffix = f"/wallet/{wallet_tag}" if wallet_tag else ""
+        if self.nodes is None:
+            async for item in self._stream_from(
+                self.rpcaddress + suffix, payload, stream
+            ):
+                yield item
+        else:
+            endpoint = node or self.nodes.select(
+                not wallet_tag and self._is_read(payload)
+            )
+            async with self.nodes.track(endpoint, observe=False):
+                async for item in self._stream_from(
+                    endpoint.url + suffix, payload, stream
+                ):
+                    yield item
+        if stream.envelope.get("error"):
+            raise ValueError(stream.envelope["error"])
+        if not stream.found:
+            raise ValueError(f"No {'.'.join(stream.path)} array in {method} response")
+
+    async def _stream_from(
+        self, address: str, payload: dict, stream: JSONArrayStream
+    ) -> AsyncIterator:
+        method = payload["method"]
+        if self.metrics is not None:
+            self.metrics.request_started(method)
+        started = perf_counter()
+        status = None
+        size = 0
+        try:
+            async with self._get_session().post(url=address, json=payload) as resp:
+                status = resp.status
+                if status >= 400 and resp.content_type != "application/json":
+                    resp.raise_for_status()
+                async for chunk in resp.content.iter_chunked(self.stream_chunk_size):
+                    size += len(chunk)
+                    for item in stream.feed(chunk):
+                        yield item
+        finally:
+            if self.metrics is not None:
+                self.metrics.request_finished(
+                    method,
+                    perf_counter() - started,
+                    status=status,
+                    error_codes=error_codes(stream.envelope),
+                    response_size=size,
+                )
 
     @abstractmethod
     async def get_base_wallet_balance(self):
@@ -74,6 +370,72 @@ class AbstractRPCProvider(ABC):
 
 
 class BitcoinLikeProvider(AbstractRPCProvider):
+    hd_network = "btc"
+
+    def __init__(
+        self,
+        *args,
+        max_loaded_wallets: int = 32,
+        wallet_idle_timeout: float = 300.0,
+        zmq_address: str | None = None,
+        zmq_topics: tuple[str, ...] = ("hashtx",),
+        tx_wait_timeout: float = 20.0,
+        header_depth: int = 144,
+        header_index_path: str | None = None,
+        header_refresh_interval: float = 5.0,
+        payout_window: float = 2.0,
+        payout_batch_size: int = 100,
+        xpub: str | None = None,
+        hd_cache_size: int = 100_000,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.wallets = WalletResidencyManager(
+            self, max_loaded=max_loaded_wallets, idle_timeout=wallet_idle_timeout
+        )
+        self.tx_waiter = TransactionWaiter(
+            zmq_address, topics=zmq_topics + ("hashblock",)
+        )
+        self.tx_wait_timeout = tx_wait_timeout
+        self.headers = HeaderIndex(
+            self,
+            depth=header_depth,
+            path=header_index_path,
+            refresh_interval=header_refresh_interval,
+        )
+        self.tx_waiter.add_block_listener(self.headers.mark_stale)
+        self.payouts = PayoutBatcher(
+            self, window=payout_window, max_size=payout_batch_size
+        )
+        self.derivation = (
+            HDDeriver(xpub, self.hd_network, cache_size=hd_cache_size) if xpub else None
+        )
+
+    async def close(self):
+        await self.payouts.close()
+        await self.tx_waiter.close()
+        await self.headers.close()
+        await self.wallets.close()
+        await super().close()
+
+    async def _send_request(
+        self,
+        method: str,
+        params: str = None,
+        wallet_tag: str = "",
+        node: Endpoint | None = None,
+    ):
+        response = await super()._send_request(method, params, wallet_tag, node)
+        error = response.get("error") if isinstance(response, dict) else None
+        if (
+            wallet_tag
+            and error
+            and error.get("code") == WALLET_NOT_LOADED
+            and await self.wallets.reload(wallet_tag)
+        ):
+            response = await super()._send_request(method, params, wallet_tag, node)
+        return response
+
     async def get_base_wallet_balance(self):
         if IS_DEV:
             wallet = "dev_main"
@@ -104,10 +466,46 @@ class BitcoinLikeProvider(AbstractRPCProvider):
             raise ValueError(response.get("error"))
         return response.get("result")
 
+    async def send_many_from_base_wallet(self, amounts: dict[str, float]) -> str:
+        wallet_tag = "dev_main" if IS_DEV else "main"
+        response = await self._send_request(
+            "sendmany",
+            ["", amounts, 1, "withdraw_sended", [], True, None, "unset", 50],
+            wallet_tag=wallet_tag,
+        )
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
+        return response.get("result")
+
+    async def get_payout_outputs(self, txid: str) -> dict[str, int]:
+        wallet_tag = "dev_main" if IS_DEV else "main"
+        response = await self._send_request(
+            "gettransaction", [txid], wallet_tag=wallet_tag
+        )
+        result = response.get("result")
+        if not result:
+            raise ValueError(response.get("error"))
+        return {
+            detail["address"]: detail["vout"]
+            for detail in result.get("details", [])
+            if detail.get("category") == "send"
+        }
+
     async def get_balance_from_node(self, wallet) -> int:
         response = await self._send_request("getbalance", [wallet])
         return int(response["result"])
 
+    async def get_balance_from_node_many(
+        self, wallets: list[str]
+    ) -> dict[str, int | None]:
+        responses = await self._send_batch(
+            [("getbalance", [wallet]) for wallet in wallets]
+        )
+        return {
+            wallet: None if resp.get("result") is None else int(resp["result"])
+            for wallet, resp in zip(wallets, responses)
+        }
+
     async def get_transactions_list(self, blockhash) -> list[str]:
         response = await self._send_request("getblock", [blockhash])
         return response["tx"]
@@ -116,31 +514,82 @@ class BitcoinLikeProvider(AbstractRPCProvider):
         response = await self._send_request("getrawtransaction", [txid])
         return response
 
-    async def send_from_tag(
-        self, to_address: str, from_tag: str, amount: float
+    async def get_block_count(self, node: Endpoint | None = None) -> int:
+        response = await self._send_request("getblockcount", [], node=node)
+        if response.get("result") is None:
+            raise ValueError(response.get("error"))
+        return response["result"]
+
+    async def get_block_by_height(
+        self, height: int, node: Endpoint | None = None
     ) -> dict:
-        await self.load_wallet_by_tag(from_tag)
+        node = node or self._read_node(height)
+        response = await self._send_request("getblockhash", [height], node=node)
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
         response = await self._send_request(
-            "sendtoaddress",
-            [
-                str(to_address),
-                amount,
-                "transit_from",
-                "transit_to",
-                True,
-                True,
-                None,
-                "unset",
-                None,
-                51,
-            ],
-            wallet_tag=from_tag,
+            "getblock", [response["result"], 2], node=node
+        )
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
+        return response["result"]
+
+    async def iter_block_transactions(self, height: int) -> AsyncIterator[dict]:
+        node = self._read_node(height)
+        response = await self._send_request("getblockhash", [height], node=node)
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
+        async for transaction in self._stream_request(
+            "getblock", [response["result"], 2], ("tx",), node=node
+        ):
+            yield transaction
+
+    def scan_blocks(
+        self,
+        start_height: int | None = None,
+        end_height: int | None = None,
+        prefetch: int = 8,
+        checkpoint=None,
+    ):
+        scanner = BlockScanner(self, prefetch=prefetch, checkpoint=checkpoint)
+        return scanner.scan(start_height, end_height)
+
+    async def get_data_by_txid_many(self, txids: list[str]) -> dict[str, dict]:
+        responses = await self._send_batch(
+            [("getrawtransaction", [txid]) for txid in txids]
         )
-        await self.unload_wallet_by_tag(from_tag)
+        return dict(zip(txids, responses))
+
+    async def send_from_tag(
+        self, to_address: str, from_tag: str, amount: float
+    ) -> dict:
+        async with self.wallets.hold(from_tag):
+            response = await self._send_request(
+                "sendtoaddress",
+                [
+                    str(to_address),
+                    amount,
+                    "transit_from",
+                    "transit_to",
+                    True,
+                    True,
+                    None,
+                    "unset",
+                    None,
+                    51,
+                ],
+                wallet_tag=from_tag,
+            )
         if not response.get("result"):
             raise ValueError(response.get("error"))
         return response.get("result")
 
+    async def sweep_tags(
+        self, tags: list[str], to_address: str, max_inputs: int = 500
+    ) -> list[SweepResult]:
+        engine = SweepEngine(self, max_inputs=max_inputs)
+        return await engine.sweep(tags, to_address)
+
     async def create_wallet(self, tag: str):
         resp = await self._send_request(
             "createwallet",
@@ -150,24 +599,65 @@ class BitcoinLikeProvider(AbstractRPCProvider):
         )
         return resp
 
+    def derive_address(self, index: int, change: int = 0) -> str:
+        if self.derivation is None:
+            raise ValueError("xpub is not configured")
+        return self.derivation.address(index, change)
+
+    async def create_watch_only_wallet(
+        self, tag: str, range_end: int, timestamp: int | str = "now"
+    ) -> list[dict]:
+        if self.derivation is None:
+            raise ValueError("xpub is not configured")
+        resp = await self._send_request(
+            "createwallet",
+            {
+                "wallet_name": tag,
+                "disable_private_keys": True,
+                "blank": True,
+                "descriptors": True,
+            },
+        )
+        error = resp.get("error")
+        if error and error.get("code") != WALLET_ALREADY_EXISTS:
+            raise ValueError(error)
+        descriptor = self.derivation.descriptor()
+        resp = await self._send_request("getdescriptorinfo", [descriptor])
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        async with self.wallets.hold(tag):
+            resp = await self._send_request(
+                "importdescriptors",
+                [
+                    [
+                        {
+                            "desc": f'{descriptor}#{resp["result"]["checksum"]}',
+                            "timestamp": timestamp,
+                            "range": [0, range_end],
+                            "internal": False,
+                        }
+                    ]
+                ],
+                wallet_tag=tag,
+            )
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        return resp["result"]
+
     async def get_address_from_name(self, tag: str):
         await self._send_request("getnewaddress", [], wallet_tag=tag)
         resp = await self._send_request("getaddressesbylabel", [""], wallet_tag=tag)
         return next(iter(resp.get("result")))
 
     async def get_tag_transaction(self, tag: str, transaction_id: str):
-        attempts = 0
-        while attempts < 20:
-            await self.load_wallet_by_tag(tag)
-            resp = await self._send_request(
-                "gettransaction", [transaction_id], wallet_tag=tag
+        async with self.wallets.hold(tag):
+            return await self.tx_waiter.wait(
+                transaction_id,
+                lambda: self._send_request(
+                    "gettransaction", [transaction_id], wallet_tag=tag
+                ),
+                timeout=self.tx_wait_timeout,
             )
-            if resp.get("result"):
-                break
-            attempts += 1
-            await sleep(1)
-        await self.unload_wallet_by_tag(tag)
-        return resp
 
     async def load_wallet_by_tag(self, tag: str) -> dict:
         resp = await self._send_request("loadwallet", [tag])
@@ -184,24 +674,71 @@ class BitcoinLikeProvider(AbstractRPCProvider):
         resp = await self._send_request("gettransaction", [txid], wallet_tag=tag)
         return resp.get("result")
 
+    async def get_confs_from_network_many(self, txids: list[str]) -> dict[str, dict]:
+        tag = "dev_main" if IS_DEV else "main"
+        responses = await self._send_batch(
+            [("gettransaction", [txid]) for txid in txids], wallet_tag=tag
+        )
+        return {txid: resp.get("result") for txid, resp in zip(txids, responses)}
+
+    async def get_confs_from_index(self, txids: list[str]) -> dict[str, int | None]:
+        self.tx_waiter.start()
+        return await self.headers.confirmations(txids)
+
     async def list_transactions_last(self, tag, repository):
         result = await self._send_request("listtransactions", [], wallet_tag=tag)
         result = result.get("result")
         if not result:
             return
-        last_transaction = None
-        for transaction in reversed(result):
-            if transaction["amount"] < 0:
-                continue
-            exists = await repository.income_exists(transaction["txid"])
-            if exists:
-                continue
-            last_transaction = transaction
-            break
-        return last_transaction["txid"]
+        incoming = [
+            transaction
+            for transaction in reversed(result)
+            if transaction["amount"] >= 0
+        ]
+        if not hasattr(repository, "incomes_existing"):
+            for transaction in incoming:
+                if not await repository.income_exists(transaction["txid"]):
+                    return transaction["txid"]
+            return
+        existing = await repository.incomes_existing(
+            [transaction["txid"] for transaction in incoming]
+        )
+        for transaction in incoming:
+            if transaction["txid"] not in existing:
+                return transaction["txid"]
+
+    async def iter_wallet_transactions(
+        self, tag: str, count: int = 10, skip: int = 0
+    ) -> AsyncIterator[dict]:
+        async with self.wallets.hold(tag):
+            async for transaction in self._stream_request(
+                "listtransactions", ["*", count, skip], wallet_tag=tag
+            ):
+                yield transaction
+
+    async def list_incoming_since(
+        self, tag: str, blockhash: str | None = None, target_confirmations: int = 6
+    ) -> tuple[list[dict], str]:
+        resp = await self._send_request(
+            "listsinceblock",
+            [blockhash or "", target_confirmations, False, False],
+            wallet_tag=tag,
+        )
+        result = resp.get("result")
+        if not result:
+            raise ValueError(resp.get("error"))
+        incoming = [
+            transaction
+            for transaction in result["transactions"]
+            if transaction.get("category") == "receive"
+        ]
+        return incoming, result["lastblock"]
 
 
 class EtherLikeProvider(AbstractRPCProvider):
+    tip_method = "eth_blockNumber"
+    read_methods = EVM_READ_METHODS
+
     async def get_base_wallet_balance(self):
         ...
 
@@ -0,0 +1,50 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator
+
+
+class BlockScanner:
+    def __init__(self, provider, prefetch: int = 8, checkpoint=None):
+        self.provider = provider
+        self.prefetch = max(prefetch, 1)
+        self.checkpoint = checkpoint
+        self.last_height: int | None = None
+
+    async def scan(
+        self, start_height: int | None = None, end_height: int | None = None
+    ) -> AsyncIterator[tuple[int, dict]]:
+        if start_height is None:
+            start_height = await self._resume_height()
+        node = self.provider._read_node(end_height)
+        if end_height is None:
+            end_height = await self.provider.get_block_count(node)
+        pending: deque[tuple[int, asyncio.Task]] = deque()
+        next_height = start_height
+        try:
+            while pending or next_height <= end_height:
+                while next_height <= end_height and len(pending) < self.prefetch:
+                    pending.append(
+                        (
+                            next_height,
+                            asyncio.ensure_future(
+                                self.provider.get_block_by_height(next_height, node)
+                            ),
+                        )
+                    )
+                    next_height += 1
+                height, task = pending.popleft()
+                block = await task
+                for transaction in block["tx"]:
+                    yield height, transaction
+                self.last_height = height
+                if self.checkpoint is not None:
+                    await self.checkpoint.set_height(height)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _resume_height(self) -> int:
+        if self.checkpoint is None:
+            raise ValueError("start_height is required without a checkpoint")
+        height = await self.checkpoint.get_height()
+        return 0 if height is None else height + 1
@@ -31,24 +31,23 @@ class BitcoinRPCProvider(BitcoinLikeProvider):
     async def send_from_tag(
         self, to_address: str, from_tag: str, amount: float
     ) -> dict:
-        await self.load_wallet_by_tag(from_tag)
-        response = await self._send_request(
-            "sendtoaddress",
-            [
-                str(to_address),
-                amount,
-                "transit_from",
-                "transit_to",
-                True,
-                True,
-                None,
-                "unset",
-                None,
-                51,
-            ],
-            wallet_tag=from_tag,
-        )
-        await self.unload_wallet_by_tag(from_tag)
+        async with self.wallets.hold(from_tag):
+            response = await self._send_request(
+                "sendtoaddress",
+                [
+                    str(to_address),
+                    amount,
+                    "transit_from",
+                    "transit_to",
+                    True,
+                    True,
+                    None,
+                    "unset",
+                    None,
+                    51,
+                ],
+                wallet_tag=from_tag,
+            )
         if not response.get("result"):
             raise ValueError(response.get("error"))
         return response.get("result")
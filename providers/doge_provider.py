@@ -1,13 +1,34 @@
 import os
+from typing import AsyncIterator
 
 from .abstract_provider import BitcoinLikeProvider
+from .node_pool import Endpoint
+from .sweeper import SweepResult
 
 
 class DogeRPCProvider(BitcoinLikeProvider):
+    hd_network = "doge"
+
     async def create_wallet(self, tag: str):
         result = await self._send_request("getnewaddress", [tag])
         return result
 
+    async def create_watch_only_wallet(
+        self, tag: str, range_end: int, timestamp: int | str = "now"
+    ) -> list[dict]:
+        if self.derivation is None:
+            raise ValueError("xpub is not configured")
+        responses = await self._send_batch(
+            [
+                ("importaddress", [address, tag, False])
+                for address in self.derivation.addresses(0, range_end + 1)
+            ]
+        )
+        for resp in responses:
+            if resp.get("error"):
+                raise ValueError(resp.get("error"))
+        return responses
+
     async def get_address_from_name(self, tag: str) -> str:
         resp = await self._send_request("getaccountaddress", [tag])
         return resp.get("result")
@@ -64,6 +85,24 @@ class DogeRPCProvider(BitcoinLikeProvider):
             raise ValueError(resp.get("error"))
         return resp.get("result")
 
+    async def send_many_from_base_wallet(self, amounts: dict[str, float]) -> str:
+        main_tag = "dev_main" if os.environ.get("IS_DEV") else "main"
+        resp = await self._send_request("sendmany", [main_tag, amounts])
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        return resp.get("result")
+
+    async def get_payout_outputs(self, txid: str) -> dict[str, int]:
+        resp = await self._send_request("gettransaction", [txid])
+        result = resp.get("result")
+        if not result:
+            raise ValueError(resp.get("error"))
+        return {
+            detail["address"]: detail["vout"]
+            for detail in result.get("details", [])
+            if detail.get("category") == "send"
+        }
+
     async def get_base_wallet_balance(self):
         if os.environ.get("IS_DEV"):
             wallet = "dev_main"
@@ -85,6 +124,97 @@ class DogeRPCProvider(BitcoinLikeProvider):
         resp = await self._send_request("move", [from_tag, to_main, amount])
         return resp
 
+    async def sweep_tags(
+        self, tags: list[str], to_address: str, max_inputs: int = 500
+    ) -> list[SweepResult]:
+        to_main = "dev_main" if os.environ.get("IS_DEV") else "main"
+        responses = await self._send_batch([("getbalance", [tag]) for tag in tags])
+        balances = {
+            tag: resp["result"]
+            for tag, resp in zip(tags, responses)
+            if resp.get("result")
+        }
+        if not balances:
+            return []
+        responses = await self._send_batch(
+            [("move", [tag, to_main, amount]) for tag, amount in balances.items()]
+        )
+        for resp in responses:
+            if not resp.get("result"):
+                raise ValueError(resp.get("error"))
+        return [SweepResult(None, list(balances), sum(balances.values()))]
+
     async def get_confs_from_network(self, txid: str) -> dict:
         resp = await self._send_request("gettransaction", [txid])
         return resp.get("result")
+
+    async def get_confs_from_network_many(self, txids: list[str]) -> dict[str, dict]:
+        responses = await self._send_batch(
+            [("gettransaction", [txid]) for txid in txids]
+        )
+        return {txid: resp.get("result") for txid, resp in zip(txids, responses)}
+
+    async def list_incoming_since(
+        self, tag: str, blockhash: str | None = None, target_confirmations: int = 6
+    ) -> tuple[list[dict], str]:
+        resp = await self._send_request(
+            "listsinceblock", [blockhash or "", target_confirmations]
+        )
+        result = resp.get("result")
+        if not result:
+            raise ValueError(resp.get("error"))
+        incoming = [
+            transaction
+            for transaction in result["transactions"]
+            if transaction.get("category") == "receive"
+            and transaction.get("account") == tag
+        ]
+        return incoming, result["lastblock"]
+
+    async def get_block_by_height(
+        self, height: int, node: Endpoint | None = None
+    ) -> dict:
+        node = node or self._read_node(height)
+        response = await self._send_request("getblockhash", [height], node=node)
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
+        response = await self._send_request(
+            "getblock", [response["result"], True], node=node
+        )
+        block = response.get("result")
+        if not block:
+            raise ValueError(response.get("error"))
+        responses = await self._send_batch(
+            [("getrawtransaction", [txid, 1]) for txid in block["tx"]], node=node
+        )
+        for resp in responses:
+            if not resp.get("result"):
+                raise ValueError(resp.get("error"))
+        block["tx"] = [resp["result"] for resp in responses]
+        return block
+
+    async def iter_block_transactions(self, height: int) -> AsyncIterator[dict]:
+        node = self._read_node(height)
+        response = await self._send_request("getblockhash", [height], node=node)
+        if not response.get("result"):
+            raise ValueError(response.get("error"))
+        response = await self._send_request(
+            "getblock", [response["result"], True], node=node
+        )
+        block = response.get("result")
+        if not block:
+            raise ValueError(response.get("error"))
+        txids = block["tx"]
+        for start in range(0, len(txids), self.batch_size):
+            responses = await self._send_batch_chunk(
+                [
+                    ("getrawtransaction", [txid, 1])
+                    for txid in txids[start : start + self.batch_size]
+                ],
+                "",
+                node,
+            )
+            for resp in responses:
+                if not resp.get("result"):
+                    raise ValueError(resp.get("error"))
+                yield resp["result"]
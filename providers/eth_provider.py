@@ -1,5 +1,28 @@
+from web3 import AsyncHTTPProvider
+from web3._utils.request import async_make_post_request
+
 from .abstract_provider import EtherLikeProvider
+from .node_pool import EVM_READ_METHODS, NodePool
 
 
 class EtherProvider(EtherLikeProvider):
     pass
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    def __init__(self, nodes: NodePool, **kwargs):
+        super().__init__(nodes.primary.url, **kwargs)
+        self.nodes = nodes
+
+    async def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+
+        async def call(url: str):
+            raw_response = await async_make_post_request(
+                url, request_data, **self.get_request_kwargs()
+            )
+            return self.decode_rpc_response(raw_response)
+
+        if method in EVM_READ_METHODS:
+            return await self.nodes.read(call, str(method))
+        return await self.nodes.write(call)
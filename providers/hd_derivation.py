@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+from collections import OrderedDict
+from typing import NamedTuple
+
+import base58
+from coincurve import PublicKey
+
+
+HARDENED = 0x80000000
+XPUB_VERSION = bytes.fromhex("0488b21e")
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+class HDNetwork(NamedTuple):
+    p2pkh_version: int
+    hrp: str | None
+
+
+NETWORKS = {
+    "btc": HDNetwork(0x00, "bc"),
+    "ltc": HDNetwork(0x30, "ltc"),
+    "doge": HDNetwork(0x1E, None),
+}
+
+
+def hash160(data: bytes) -> bytes:
+    digest = hashlib.sha256(data).digest()
+    try:
+        return hashlib.new("ripemd160", digest).digest()
+    except ValueError:
+        from Crypto.Hash import RIPEMD160
+
+        return RIPEMD160.new(digest).digest()
+
+
+def _bech32_polymod(values: list[int]) -> int:
+    generator = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                checksum ^= generator[i]
+    return checksum
+
+
+def _convert_bits(data: bytes, from_bits: int, to_bits: int) -> list[int]:
+    acc, bits, result = 0, 0, []
+    mask = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((acc >> bits) & mask)
+    if bits:
+        result.append((acc << (to_bits - bits)) & mask)
+    return result
+
+
+def encode_segwit_v0(hrp: str, program: bytes) -> str:
+    data = [0] + _convert_bits(program, 8, 5)
+    expanded = [ord(char) >> 5 for char in hrp] + [0]
+    expanded += [ord(char) & 31 for char in hrp]
+    polymod = _bech32_polymod(expanded + data + [0] * 6) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + "1" + "".join(BECH32_CHARSET[value] for value in data + checksum)
+
+
+def encode_p2pkh(version: int, pubkey_hash: bytes) -> str:
+    return base58.b58encode_check(bytes([version]) + pubkey_hash).decode()
+
+
+def parse_extended_key(extended_key: str) -> tuple[bytes, bytes]:
+    raw = base58.b58decode_check(extended_key)
+    if len(raw) != 78 or raw[45] not in (2, 3):
+        raise ValueError("Invalid extended public key")
+    return raw[13:45], raw[45:78]
+
+
+def derive_child(chain_code: bytes, key: bytes, index: int) -> tuple[bytes, bytes]:
+    if index >= HARDENED:
+        raise ValueError("Hardened derivation requires a private key")
+    digest = hmac.new(
+        chain_code, key + index.to_bytes(4, "big"), hashlib.sha512
+    ).digest()
+    child = PublicKey(key).add(digest[:32])
+    return digest[32:], child.format(compressed=True)
+
+
+class HDDeriver:
+    def __init__(self, xpub: str, network: str = "btc", cache_size: int = 100_000):
+        self.xpub = xpub
+        self.network = NETWORKS[network]
+        self.cache_size = cache_size
+        self._root = parse_extended_key(xpub)
+        self._branches: dict[int, tuple[bytes, bytes]] = {}
+        self._addresses: OrderedDict[tuple[int, int], str] = OrderedDict()
+
+    def descriptor(self, change: int = 0) -> str:
+        xpub = base58.b58encode_check(
+            XPUB_VERSION + base58.b58decode_check(self.xpub)[4:]
+        ).decode()
+        script = "wpkh" if self.network.hrp else "pkh"
+        return f"{script}({xpub}/{change}/*)"
+
+    def address(self, index: int, change: int = 0) -> str:
+        key = (change, index)
+        address = self._addresses.get(key)
+        if address is not None:
+            self._addresses.move_to_end(key)
+            return address
+        branch = self._branches.get(change)
+        if branch is None:
+            branch = self._branches[change] = derive_child(*self._root, change)
+        _, pubkey = derive_child(*branch, index)
+        if self.network.hrp:
+            address = encode_segwit_v0(self.network.hrp, hash160(pubkey))
+        else:
+            address = encode_p2pkh(self.network.p2pkh_version, hash160(pubkey))
+        self._addresses[key] = address
+        while len(self._addresses) > self.cache_size:
+            self._addresses.popitem(last=False)
+        return address
+
+    def addresses(self, start: int, end: int, change: int = 0) -> list[str]:
+        return [self.address(index, change) for index in range(start, end)]
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from time import monotonic
+
+from .node_pool import Endpoint
+
+
+class HeaderIndex:
+    def __init__(
+        self,
+        provider,
+        depth: int = 144,
+        path: str | None = None,
+        refresh_interval: float = 5.0,
+        max_tracked: int = 100_000,
+    ):
+        self.provider = provider
+        self.depth = depth
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.max_tracked = max_tracked
+        self.tip: int | None = None
+        self._hashes: dict[int, str] = {}
+        self._tracked: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._refreshed_at = 0.0
+        self._refreshing: asyncio.Task | None = None
+        if path and os.path.exists(path):
+            self._load()
+
+    def mark_stale(self, blockhash: str | None = None):
+        self._refreshed_at = 0.0
+
+    def track(self, txid: str, height: int, blockhash: str):
+        self._tracked[txid] = (height, blockhash)
+        self._tracked.move_to_end(txid)
+        while len(self._tracked) > self.max_tracked:
+            self._tracked.popitem(last=False)
+
+    def untrack(self, txids: list[str]):
+        for txid in txids:
+            self._tracked.pop(txid, None)
+
+    async def refresh(self):
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._refreshing)
+
+    async def confirmations(self, txids: list[str]) -> dict[str, int | None]:
+        if monotonic() - self._refreshed_at >= self.refresh_interval:
+            await self.refresh()
+        result = {}
+        unknown = []
+        for txid in txids:
+            entry = self._tracked.get(txid)
+            if entry is None or not self._is_canonical(*entry):
+                unknown.append(txid)
+                continue
+            self._tracked.move_to_end(txid)
+            result[txid] = self.tip - entry[0] + 1
+        if unknown:
+            fetched = await self.provider.get_confs_from_network_many(unknown)
+            for txid, transaction in fetched.items():
+                result[txid] = self._track_fetched(txid, transaction)
+        return result
+
+    async def close(self):
+        if self._refreshing is not None and not self._refreshing.done():
+            self._refreshing.cancel()
+        if self.path:
+            await asyncio.to_thread(self._save)
+
+    def _is_canonical(self, height: int, blockhash: str) -> bool:
+        known = self._hashes.get(height)
+        if known is None:
+            return height <= self.tip - self.depth
+        return known == blockhash
+
+    def _track_fetched(self, txid: str, transaction: dict | None) -> int | None:
+        if not transaction:
+            return None
+        confirmations = transaction.get("confirmations", 0)
+        blockhash = transaction.get("blockhash")
+        if confirmations <= 0 or not blockhash:
+            return confirmations
+        height = transaction.get("blockheight", self.tip - confirmations + 1)
+        if height > self.tip:
+            self.mark_stale()
+            return confirmations
+        self.track(txid, height, blockhash)
+        return self.tip - height + 1
+
+    async def _refresh(self):
+        node = self.provider._read_node()
+        responses = await self.provider._send_batch(
+            [("getblockcount", []), ("getbestblockhash", [])], node=node
+        )
+        for resp in responses:
+            if resp.get("result") is None:
+                raise ValueError(resp.get("error"))
+        tip, best = responses[0]["result"], responses[1]["result"]
+        self._refreshed_at = monotonic()
+        if self.tip == tip and self._hashes.get(tip) == best:
+            return
+        low = max(tip - self.depth + 1, 0)
+        start = low if self.tip is None else max(low, min(self.tip, tip) - 5)
+        hashes = await self._fetch_hashes(start, tip, node)
+        known = self._hashes.get(start)
+        if start > low and known is not None and known != hashes[start]:
+            hashes.update(await self._fetch_hashes(low, start - 1, node))
+        orphaned = {
+            blockhash
+            for height, blockhash in self._hashes.items()
+            if height > tip or hashes.get(height, blockhash) != blockhash
+        }
+        self._hashes = {
+            height: blockhash
+            for height, blockhash in self._hashes.items()
+            if low <= height <= tip
+        }
+        self._hashes.update(hashes)
+        self._hashes[tip] = best
+        self.tip = tip
+        self.untrack(
+            [
+                txid
+                for txid, (height, blockhash) in self._tracked.items()
+                if blockhash in orphaned
+            ]
+        )
+        if self.path:
+            await asyncio.to_thread(self._save)
+
+    async def _fetch_hashes(
+        self, start: int, end: int, node: Endpoint | None = None
+    ) -> dict[int, str]:
+        heights = list(range(start, end + 1))
+        responses = await self.provider._send_batch(
+            [("getblockhash", [height]) for height in heights], node=node
+        )
+        hashes = {}
+        for height, resp in zip(heights, responses):
+            if not resp.get("result"):
+                raise ValueError(resp.get("error"))
+            hashes[height] = resp["result"]
+        return hashes
+
+    def _load(self):
+        with open(self.path) as file:
+            state = json.load(file)
+        self.tip = state["tip"]
+        self._hashes = {int(height): value for height, value in state["hashes"].items()}
+        for txid, (height, blockhash) in state["tracked"].items():
+            self.track(txid, height, blockhash)
+
+    def _save(self):
+        state = {
+            "tip": self.tip,
+            "hashes": self._hashes,
+            "tracked": self._tracked,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.path)
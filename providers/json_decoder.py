@@ -0,0 +1,171 @@
+import codecs
+import json
+import re
+from decimal import Decimal
+from functools import partial
+from typing import Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+SATOSHIS = Decimal(100_000_000)
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+TOKEN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)(")?|[{}\[\]:,]')
+
+
+def decode_fast(raw: bytes | str):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+decode_decimal = partial(json.loads, parse_float=Decimal)
+
+DECODERS: dict[str, Callable] = {
+    "json": json.loads,
+    "fast": decode_fast,
+    "decimal": decode_decimal,
+}
+
+
+def get_decoder(decoder: str | Callable | None) -> Callable | None:
+    if decoder is None or callable(decoder):
+        return decoder
+    return DECODERS[decoder]
+
+
+def to_satoshis(amount: Decimal | float | str | int) -> int:
+    return int((Decimal(str(amount)) * SATOSHIS).to_integral_value())
+
+
+def encode_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+dumps = partial(json.dumps, default=encode_default)
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "expects_key")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key = None
+        self.expects_key = is_object
+
+
+class JSONArrayStream:
+    def __init__(self, path: tuple[str, ...], parse_float: Callable | None = None):
+        self.path = tuple(path)
+        self._json = json.JSONDecoder(parse_float=parse_float)
+        self.envelope: dict = {}
+        self.found = False
+        self._buffer = ""
+        self._position = 0
+        self._stack: list[_Frame] = []
+        self._keys: list = []
+        self._target_depth: int | None = None
+        self._element_start: int | None = None
+        self._envelope_key = None
+        self._envelope_start: int | None = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk: bytes) -> list:
+        self._buffer += self._decoder.decode(chunk)
+        items = []
+        buffer = self._buffer
+        while True:
+            if self._element_start is not None:
+                position = WHITESPACE.match(buffer, self._position).end()
+                if position == len(buffer):
+                    break
+                if buffer[position] != "]":
+                    try:
+                        item, end = self._json.raw_decode(buffer, position)
+                    except ValueError:
+                        break
+                    following = WHITESPACE.match(buffer, end).end()
+                    if following == len(buffer) or buffer[following] not in ",]":
+                        break
+                    items.append(item)
+                    self._position = end
+                    self._element_start = None
+                    continue
+            match = TOKEN.search(buffer, self._position)
+            if match is None:
+                break
+            token = match.group()
+            if token[0] == '"' and match.group(2) is None:
+                break
+            self._position = match.end()
+            if token[0] == '"':
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and frame.expects_key:
+                    frame.key = json.loads(token)
+                continue
+            self._structural(token, match.start(), match.end())
+        self._compact()
+        return items
+
+    def _structural(self, token: str, start: int, end: int):
+        depth = len(self._stack)
+        if token in "{[":
+            if self._target_depth is None and token == "[":
+                if self._keys == list(self.path) and depth == len(self.path):
+                    self._target_depth = depth + 1
+                    self.found = True
+                    self._element_start = end
+            self._stack.append(_Frame(token == "{"))
+            self._keys.append(None)
+            return
+        if token in "}]":
+            if self._target_depth == depth:
+                self._target_depth = None
+                self._element_start = None
+            if depth == 1:
+                self._finish_envelope(start)
+            self._stack.pop()
+            self._keys.pop()
+            if len(self._stack) == 1:
+                self._finish_envelope(end)
+            return
+        frame = self._stack[-1]
+        if token == ":":
+            frame.expects_key = False
+            self._keys[-1] = frame.key
+            if depth == 1 and frame.key != (self.path[0] if self.path else None):
+                self._envelope_key = frame.key
+                self._envelope_start = end
+            return
+        if self._target_depth == depth:
+            self._element_start = end
+        if depth == 1:
+            self._finish_envelope(start)
+        frame.expects_key = frame.is_object
+
+    def _finish_envelope(self, end: int):
+        if self._envelope_start is None:
+            return
+        text = self._buffer[self._envelope_start : end].strip()
+        if text:
+            self.envelope[self._envelope_key] = self._json.decode(text)
+        self._envelope_key = None
+        self._envelope_start = None
+
+    def _compact(self):
+        keep = self._position
+        for start in (self._element_start, self._envelope_start):
+            if start is not None:
+                keep = min(keep, start)
+        if keep:
+            self._buffer = self._buffer[keep:]
+            self._position -= keep
+            if self._element_start is not None:
+                self._element_start -= keep
+            if self._envelope_start is not None:
+                self._envelope_start -= keep
@@ -2,4 +2,4 @@ from .abstract_provider import BitcoinLikeProvider
 
 
 class LtcRPCProvider(BitcoinLikeProvider):
-    ...
+    hd_network = "ltc"
@@ -0,0 +1,217 @@
+from bisect import bisect_left
+from time import perf_counter
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _MethodStats:
+    __slots__ = (
+        "count",
+        "latency_sum",
+        "buckets",
+        "request_bytes",
+        "response_bytes",
+        "statuses",
+        "errors",
+        "retries",
+        "in_flight",
+    )
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (bucket_count + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: dict[int, int] = {}
+        self.errors: dict[int, int] = {}
+        self.retries = 0
+        self.in_flight = 0
+
+
+class RPCMetrics:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._methods: dict[str, _MethodStats] = {}
+
+    def request_started(self, method: str):
+        self._stats(method).in_flight += 1
+
+    def request_finished(
+        self,
+        method: str,
+        duration: float,
+        status: int | None = None,
+        error_codes: list[int] = (),
+        request_size: int | None = None,
+        response_size: int | None = None,
+    ):
+        stats = self._stats(method)
+        stats.in_flight -= 1
+        stats.count += 1
+        stats.latency_sum += duration
+        stats.buckets[bisect_left(self.buckets, duration)] += 1
+        if status is not None:
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        for code in error_codes:
+            stats.errors[code] = stats.errors.get(code, 0) + 1
+        if request_size is not None:
+            stats.request_bytes += request_size
+        if response_size is not None:
+            stats.response_bytes += response_size
+
+    def retried(self, method: str):
+        self._stats(method).retries += 1
+
+    def reset(self):
+        self._methods.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            method: {
+                "count": stats.count,
+                "latency_sum": stats.latency_sum,
+                "latency_avg": stats.latency_sum / stats.count if stats.count else 0.0,
+                "latency_buckets": dict(
+                    zip(self.buckets + (float("inf"),), stats.buckets)
+                ),
+                "request_bytes": stats.request_bytes,
+                "response_bytes": stats.response_bytes,
+                "statuses": dict(stats.statuses),
+                "errors": dict(stats.errors),
+                "retries": stats.retries,
+                "in_flight": stats.in_flight,
+            }
+            for method, stats in self._methods.items()
+        }
+
+    def prometheus(self, prefix: str = "coinslib_rpc") -> str:
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: list[tuple]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                rendered = ",".join(f'{key}="{label}"' for key, label in labels)
+                lines.append(f"{prefix}_{name}{suffix}{{{rendered}}} {value}")
+
+        methods = sorted(self._methods.items())
+        family(
+            "requests_total",
+            "counter",
+            "RPC requests by method and HTTP status.",
+            [
+                ("", (("method", method), ("status", status)), count)
+                for method, stats in methods
+                for status, count in sorted(stats.statuses.items())
+            ],
+        )
+        family(
+            "errors_total",
+            "counter",
+            "JSON-RPC errors by method and error code.",
+            [
+                ("", (("method", method), ("code", code)), count)
+                for method, stats in methods
+                for code, count in sorted(stats.errors.items())
+            ],
+        )
+        latency = []
+        for method, stats in methods:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), stats.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                latency.append(
+                    ("_bucket", (("method", method), ("le", le)), cumulative)
+                )
+            latency.append(("_sum", (("method", method),), stats.latency_sum))
+            latency.append(("_count", (("method", method),), stats.count))
+        family("latency_seconds", "histogram", "RPC latency.", latency)
+        family(
+            "request_bytes_total",
+            "counter",
+            "RPC request payload bytes.",
+            [
+                ("", (("method", method),), stats.request_bytes)
+                for method, stats in methods
+            ],
+        )
+        family(
+            "response_bytes_total",
+            "counter",
+            "RPC response payload bytes.",
+            [
+                ("", (("method", method),), stats.response_bytes)
+                for method, stats in methods
+            ],
+        )
+        family(
+            "retries_total",
+            "counter",
+            "RPC retries.",
+            [("", (("method", method),), stats.retries) for method, stats in methods],
+        )
+        family(
+            "in_flight",
+            "gauge",
+            "RPC requests in flight.",
+            [("", (("method", method),), stats.in_flight) for method, stats in methods],
+        )
+        return "\n".join(lines) + "\n"
+
+    def _stats(self, method: str) -> _MethodStats:
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = _MethodStats(len(self.buckets))
+        return stats
+
+
+def payload_method(payload: dict | list) -> str:
+    if isinstance(payload, dict):
+        return payload["method"]
+    methods = {call["method"] for call in payload}
+    return methods.pop() if len(methods) == 1 else "batch"
+
+
+def error_codes(response) -> list[int]:
+    responses = response if isinstance(response, list) else [response]
+    return [
+        item["error"].get("code", 0)
+        for item in responses
+        if isinstance(item, dict) and isinstance(item.get("error"), dict)
+    ]
+
+
+def _status_of(exc: Exception) -> int | None:
+    status = getattr(exc, "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def instrument_provider(provider, metrics: RPCMetrics):
+    make_request = provider.make_request
+
+    async def instrumented(method, params=None):
+        method = str(method)
+        metrics.request_started(method)
+        started = perf_counter()
+        try:
+            response = await make_request(method, params)
+        except Exception as exc:
+            metrics.request_finished(
+                method, perf_counter() - started, status=_status_of(exc)
+            )
+            raise
+        metrics.request_finished(
+            method,
+            perf_counter() - started,
+            status=200,
+            error_codes=error_codes(response),
+        )
+        return response
+
+    provider.make_request = instrumented
+    return provider
@@ -0,0 +1,254 @@
+import asyncio
+from contextlib import asynccontextmanager
+from time import monotonic, perf_counter
+from typing import Awaitable, Callable
+
+
+BITCOIN_READ_METHODS = frozenset(
+    {
+        "decoderawtransaction",
+        "estimatesmartfee",
+        "getbestblockhash",
+        "getblock",
+        "getblockchaininfo",
+        "getblockcount",
+        "getblockhash",
+        "getblockheader",
+        "getdescriptorinfo",
+        "getmempoolinfo",
+        "getrawtransaction",
+        "gettxout",
+    }
+)
+
+EVM_READ_METHODS = frozenset(
+    {
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getCode",
+        "eth_getLogs",
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+        "net_version",
+    }
+)
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: float | None = None
+        self.height: int | None = None
+        self.healthy = True
+        self.failures = 0
+        self.open_until = 0.0
+        self.in_flight = 0
+
+    def available(self, now: float) -> bool:
+        return self.healthy and self.open_until <= now
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "height": self.height,
+            "latency": self.latency,
+            "failures": self.failures,
+            "circuit_open": self.open_until > monotonic(),
+            "in_flight": self.in_flight,
+        }
+
+
+class NodePool:
+    def __init__(
+        self,
+        urls: list[str],
+        health_interval: float = 5.0,
+        probe_timeout: float = 2.0,
+        max_lag: int = 2,
+        hedge: bool = True,
+        hedge_delay: float | None = None,
+        max_attempts: int = 3,
+        failure_threshold: int = 3,
+        circuit_cooldown: float = 30.0,
+        latency_alpha: float = 0.3,
+        metrics=None,
+    ):
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.primary = self.endpoints[0]
+        self.health_interval = health_interval
+        self.probe_timeout = probe_timeout
+        self.max_lag = max_lag
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.max_attempts = max_attempts
+        self.failure_threshold = failure_threshold
+        self.circuit_cooldown = circuit_cooldown
+        self.latency_alpha = latency_alpha
+        self.metrics = metrics
+        self.probe: Callable[[str], Awaitable[int]] | None = None
+        self._checker: asyncio.Task | None = None
+
+    @property
+    def tip(self) -> int | None:
+        heights = [
+            endpoint.height
+            for endpoint in self.endpoints
+            if endpoint.healthy and endpoint.height is not None
+        ]
+        return max(heights, default=None)
+
+    def start(self):
+        if self.probe is None:
+            return
+        if self._checker is None or self._checker.done():
+            self._checker = asyncio.get_running_loop().create_task(self._check_loop())
+
+    async def close(self):
+        if self._checker is not None and not self._checker.done():
+            self._checker.cancel()
+        self._checker = None
+
+    def status(self) -> list[dict]:
+        return [endpoint.status() for endpoint in self.endpoints]
+
+    def candidates(self) -> list[Endpoint]:
+        now = monotonic()
+        tip = self.tip
+        ready = [
+            endpoint
+            for endpoint in self.endpoints
+            if endpoint.available(now)
+            and (
+                tip is None
+                or endpoint.height is None
+                or endpoint.height >= tip - self.max_lag
+            )
+        ]
+        if not ready:
+            ready = [
+                endpoint for endpoint in self.endpoints if endpoint.open_until <= now
+            ] or list(self.endpoints)
+        return sorted(ready, key=self._score)
+
+    def select(self, read: bool = True, min_height: int | None = None) -> Endpoint:
+        self.start()
+        if not read:
+            return self.primary
+        candidates = self.candidates()
+        if min_height is not None:
+            candidates = [
+                endpoint
+                for endpoint in candidates
+                if endpoint.height is None or endpoint.height >= min_height
+            ] or [self.primary]
+        return candidates[0]
+
+    async def read(self, call: Callable[[str], Awaitable], method: str = ""):
+        self.start()
+        candidates = self.candidates()[: self.max_attempts]
+        tasks: dict[asyncio.Future, Endpoint] = {}
+        error = None
+        try:
+            for position, endpoint in enumerate(candidates):
+                if position and self.metrics is not None:
+                    self.metrics.retried(method)
+                tasks[asyncio.ensure_future(self._call(endpoint, call))] = endpoint
+                last = position + 1 == len(candidates)
+                delay = None if last else self._hedge_delay(endpoint)
+                while tasks:
+                    done, _ = await asyncio.wait(
+                        tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+                    for task in done:
+                        tasks.pop(task)
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                    if not last:
+                        break
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def write(self, call: Callable[[str], Awaitable]):
+        self.start()
+        return await self._call(self.primary, call)
+
+    @asynccontextmanager
+    async def track(self, endpoint: Endpoint, observe: bool = True):
+        endpoint.in_flight += 1
+        started = perf_counter()
+        try:
+            yield endpoint
+        except Exception:
+            self._failed(endpoint)
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.failures = 0
+        endpoint.open_until = 0.0
+        if observe:
+            self._observe(endpoint, perf_counter() - started)
+
+    async def check(self):
+        await asyncio.gather(*(self._check(endpoint) for endpoint in self.endpoints))
+
+    async def _call(self, endpoint: Endpoint, call: Callable[[str], Awaitable]):
+        async with self.track(endpoint):
+            return await call(endpoint.url)
+
+    async def _check(self, endpoint: Endpoint):
+        started = perf_counter()
+        try:
+            height = await asyncio.wait_for(
+                self.probe(endpoint.url), self.probe_timeout
+            )
+        except Exception:
+            endpoint.healthy = False
+            return
+        endpoint.healthy = True
+        endpoint.height = height
+        self._observe(endpoint, perf_counter() - started)
+
+    async def _check_loop(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+    def _failed(self, endpoint: Endpoint):
+        endpoint.failures += 1
+        if endpoint.failures >= self.failure_threshold:
+            endpoint.open_until = monotonic() + self.circuit_cooldown
+
+    def _observe(self, endpoint: Endpoint, duration: float):
+        if endpoint.latency is None:
+            endpoint.latency = duration
+        else:
+            endpoint.latency += self.latency_alpha * (duration - endpoint.latency)
+
+    def _hedge_delay(self, endpoint: Endpoint) -> float | None:
+        if not self.hedge:
+            return None
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if endpoint.latency is None:
+            return 1.0
+        return max(0.05, 3 * endpoint.latency)
+
+    @staticmethod
+    def _score(endpoint: Endpoint) -> float:
+        return (endpoint.latency or 0.0) * (1 + endpoint.in_flight)
@@ -0,0 +1,112 @@
+import asyncio
+from typing import NamedTuple
+
+
+RPC_TYPE_ERROR = -3
+RPC_INVALID_ADDRESS_OR_KEY = -5
+PAYOUT_ERRORS = frozenset({RPC_TYPE_ERROR, RPC_INVALID_ADDRESS_OR_KEY})
+
+
+class PayoutResult(NamedTuple):
+    txid: str
+    vout: int | None
+
+
+class _Payout(NamedTuple):
+    address: str
+    amount: float
+    future: asyncio.Future
+
+
+class PayoutBatcher:
+    def __init__(self, provider, window: float = 2.0, max_size: int = 100):
+        self.provider = provider
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[_Payout] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def submit(self, address: str, amount: float) -> PayoutResult:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Payout(str(address), amount, future))
+        if len(self._pending) >= self.max_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._schedule_flush
+            )
+        return await future
+
+    async def flush(self):
+        self._cancel_timer()
+        while self._pending:
+            await self._flush()
+        self._cancel_timer()
+
+    async def close(self):
+        await self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule_flush(self):
+        self._cancel_timer()
+        task = asyncio.ensure_future(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self):
+        async with self._lock:
+            batch, deferred, addresses = [], [], set()
+            for payout in self._pending:
+                if payout.future.done():
+                    continue
+                if payout.address in addresses or len(batch) >= self.max_size:
+                    deferred.append(payout)
+                    continue
+                addresses.add(payout.address)
+                batch.append(payout)
+            self._pending = deferred
+            if deferred and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.window, self._schedule_flush
+                )
+            if not batch:
+                return
+            await self._send(batch)
+
+    async def _send(self, batch: list[_Payout]):
+        try:
+            txid = await self.provider.send_many_from_base_wallet(
+                {payout.address: payout.amount for payout in batch}
+            )
+        except Exception as exc:
+            if len(batch) > 1 and _error_code(exc) in PAYOUT_ERRORS:
+                middle = len(batch) // 2
+                await self._send(batch[:middle])
+                await self._send(batch[middle:])
+                return
+            for payout in batch:
+                if not payout.future.done():
+                    payout.future.set_exception(exc)
+            return
+        try:
+            outputs = await self.provider.get_payout_outputs(txid)
+        except Exception:
+            outputs = {}
+        for payout in batch:
+            if not payout.future.done():
+                payout.future.set_result(
+                    PayoutResult(txid, outputs.get(payout.address))
+                )
+
+
+def _error_code(exc: Exception) -> int | None:
+    error = exc.args[0] if exc.args else None
+    return error.get("code") if isinstance(error, dict) else None
@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+import json
+from collections import deque
+from time import monotonic, perf_counter
+from typing import Awaitable, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _strip_ids(payload):
+    if isinstance(payload, list):
+        return [_strip_ids(item) for item in payload]
+    if isinstance(payload, dict):
+        return {key: value for key, value in payload.items() if key != "id"}
+    return payload
+
+
+def _ids(payload) -> list | None:
+    if isinstance(payload, list):
+        return [item.get("id") for item in payload if isinstance(item, dict)]
+    if isinstance(payload, dict) and "id" in payload:
+        return [payload["id"]]
+    return None
+
+
+def transcript_key(path: str, payload) -> str:
+    body = json.dumps(
+        _strip_ids(payload), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return f"{path} {body}"
+
+
+def _encode(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, default=str)
+    return json.dumps(record, separators=(",", ":"), default=str).encode()
+
+
+class RPCRecorder:
+    def __init__(self, path: str, max_pending: int = 1000):
+        self.path = path
+        self._file = None
+        self._started = monotonic()
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(max_pending)
+        self._writer: asyncio.Task | None = None
+
+    async def request(self, path: str, payload, send: Callable[[], Awaitable]):
+        at = monotonic() - self._started
+        started = perf_counter()
+        record = {"at": at, "path": path, "request": payload}
+        try:
+            response = await send()
+        except Exception as exc:
+            record["error"] = f"{type(exc).__name__}: {exc}"
+            record["duration"] = perf_counter() - started
+            await self._write(record)
+            raise
+        record["duration"] = perf_counter() - started
+        record["response"] = response
+        await self._write(record)
+        return response
+
+    async def _write(self, record: dict):
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._drain())
+        await self._queue.put(_encode(record))
+
+    async def _drain(self):
+        while True:
+            lines = [await self._queue.get()]
+            while not self._queue.empty():
+                lines.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_lines, lines)
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def _write_lines(self, lines: list[bytes]):
+        if self._file is None:
+            self._file = gzip.open(self.path, "wb")
+        for line in lines:
+            self._file.write(line)
+            self._file.write(b"\n")
+
+    async def close(self):
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            await self._queue.join()
+            writer.cancel()
+        file, self._file = self._file, None
+        if file is not None:
+            await asyncio.to_thread(file.close)
+
+
+class RPCReplayer:
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self.misses = 0
+        self._records: dict[str, deque[dict]] = {}
+        with gzip.open(path, "rt") as file:
+            for line in file:
+                record = json.loads(line)
+                key = transcript_key(record["path"], record["request"])
+                self._records.setdefault(key, deque()).append(record)
+
+    async def request(self, path: str, payload, send: Callable[[], Awaitable]):
+        records = self._records.get(transcript_key(path, payload))
+        if not records:
+            self.misses += 1
+            raise LookupError(f"No recorded response for {path} {payload}")
+        record = records.popleft() if len(records) > 1 else records[0]
+        if self.speed:
+            await asyncio.sleep(record["duration"] / self.speed)
+        if "error" in record:
+            raise ConnectionError(record["error"])
+        return self._with_ids(record, payload)
+
+    @staticmethod
+    def _with_ids(record: dict, payload):
+        response = record["response"]
+        recorded, current = _ids(record["request"]), _ids(payload)
+        if not recorded or recorded == current:
+            return response
+        ids = dict(zip(map(str, recorded), current))
+        if isinstance(response, list):
+            return [
+                {**item, "id": ids.get(str(item.get("id")), item.get("id"))}
+                for item in response
+            ]
+        if isinstance(response, dict) and "id" in response:
+            return {**response, "id": ids.get(str(response["id"]), response["id"])}
+        return response
+
+    async def close(self):
+        ...
+
+
+def attach_transport(provider, transport):
+    make_request = provider.make_request
+
+    async def request(method, params=None):
+        return await transport.request(
+            str(method),
+            {"method": str(method), "params": params},
+            lambda: make_request(method, params),
+        )
+
+    provider.make_request = request
+    return provider
@@ -0,0 +1,178 @@
+import asyncio
+from math import ceil
+from typing import NamedTuple
+
+
+P2PKH_INPUT_VSIZE = 148
+P2SH_P2WPKH_INPUT_VSIZE = 91
+P2WPKH_INPUT_VSIZE = 68
+P2TR_INPUT_VSIZE = 58
+OUTPUT_VSIZE = 31
+OVERHEAD_VSIZE = 11
+DUST_LIMIT = 546
+
+
+class SweepResult(NamedTuple):
+    txid: str | None
+    tags: list[str]
+    amount: float
+
+
+class _Utxo(NamedTuple):
+    tag: str
+    txid: str
+    vout: int
+    satoshis: int
+    vsize: int
+
+
+def input_vsize(script_pubkey: str) -> int:
+    if len(script_pubkey) == 44 and script_pubkey.startswith("0014"):
+        return P2WPKH_INPUT_VSIZE
+    if len(script_pubkey) == 68 and script_pubkey.startswith("5120"):
+        return P2TR_INPUT_VSIZE
+    if len(script_pubkey) == 46 and script_pubkey.startswith("a914"):
+        return P2SH_P2WPKH_INPUT_VSIZE
+    return P2PKH_INPUT_VSIZE
+
+
+class SweepEngine:
+    def __init__(
+        self,
+        provider,
+        max_inputs: int = 500,
+        conf_target: int = 6,
+        fallback_fee_rate: float = 50,
+        concurrency: int = 8,
+    ):
+        self.provider = provider
+        self.max_inputs = max_inputs
+        self.conf_target = conf_target
+        self.fallback_fee_rate = fallback_fee_rate
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def sweep(self, tags: list[str], to_address: str) -> list[SweepResult]:
+        tags = list(dict.fromkeys(tags))
+        group_size = max(1, self.provider.wallets.max_loaded)
+        fee_rate = None
+        results = []
+        for start in range(0, len(tags), group_size):
+            group = tags[start : start + group_size]
+            async with self.provider.wallets.hold_many(group):
+                unspent = await asyncio.gather(
+                    *(self._list_unspent(tag) for tag in group)
+                )
+                utxos = [utxo for tag_utxos in unspent for utxo in tag_utxos]
+                if utxos and fee_rate is None:
+                    fee_rate = await self._fee_rate()
+                for first in range(0, len(utxos), self.max_inputs):
+                    result = await self._sweep_inputs(
+                        utxos[first : first + self.max_inputs], to_address, fee_rate
+                    )
+                    if result is not None:
+                        results.append(result)
+        return results
+
+    async def _list_unspent(self, tag: str) -> list[_Utxo]:
+        async with self._semaphore:
+            resp = await self.provider._send_request("listunspent", [1], wallet_tag=tag)
+        if resp.get("result") is None:
+            raise ValueError(resp.get("error"))
+        return [
+            _Utxo(
+                tag,
+                utxo["txid"],
+                utxo["vout"],
+                round(utxo["amount"] * 100_000_000),
+                input_vsize(utxo.get("scriptPubKey", "")),
+            )
+            for utxo in resp["result"]
+            if utxo.get("spendable", True)
+        ]
+
+    async def _fee_rate(self) -> float:
+        resp = await self.provider._send_request("estimatesmartfee", [self.conf_target])
+        feerate = (resp.get("result") or {}).get("feerate")
+        if not feerate:
+            return self.fallback_fee_rate
+        return round(feerate * 100_000_000) / 1000
+
+    async def _sweep_inputs(
+        self, utxos: list[_Utxo], to_address: str, fee_rate: float
+    ) -> SweepResult | None:
+        vsize = OVERHEAD_VSIZE + OUTPUT_VSIZE + sum(utxo.vsize for utxo in utxos)
+        satoshis = sum(utxo.satoshis for utxo in utxos) - ceil(vsize * fee_rate)
+        if satoshis < DUST_LIMIT:
+            return None
+        amount = round(satoshis / 100_000_000, 8)
+        tags = list(dict.fromkeys(utxo.tag for utxo in utxos))
+        try:
+            await self._lock_unspent(utxos, unlock=False)
+            txid = await self._send(utxos, tags, to_address, amount)
+        except Exception:
+            await self._lock_unspent(utxos, unlock=True)
+            raise
+        return SweepResult(txid, tags, amount)
+
+    async def _send(
+        self, utxos: list[_Utxo], tags: list[str], to_address: str, amount: float
+    ) -> str:
+        resp = await self.provider._send_request(
+            "createpsbt",
+            [
+                [{"txid": utxo.txid, "vout": utxo.vout} for utxo in utxos],
+                [{to_address: amount}],
+            ],
+        )
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        signed = await asyncio.gather(
+            *(self._sign(tag, resp["result"]) for tag in tags)
+        )
+        resp = await self.provider._send_request("combinepsbt", [signed])
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        resp = await self.provider._send_request("finalizepsbt", [resp["result"]])
+        result = resp.get("result")
+        if not result or not result.get("complete"):
+            raise ValueError(resp.get("error") or "PSBT is not fully signed")
+        resp = await self.provider._send_request("sendrawtransaction", [result["hex"]])
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        return resp["result"]
+
+    async def _lock_unspent(self, utxos: list[_Utxo], unlock: bool):
+        outputs: dict[str, list[dict]] = {}
+        for utxo in utxos:
+            outputs.setdefault(utxo.tag, []).append(
+                {"txid": utxo.txid, "vout": utxo.vout}
+            )
+        responses = await asyncio.gather(
+            *(
+                self._lock_tag(tag, tag_outputs, unlock)
+                for tag, tag_outputs in outputs.items()
+            ),
+            return_exceptions=True,
+        )
+        if unlock:
+            return
+        for resp in responses:
+            if isinstance(resp, Exception):
+                raise resp
+            if not resp.get("result"):
+                raise ValueError(resp.get("error"))
+
+    async def _lock_tag(self, tag: str, outputs: list[dict], unlock: bool) -> dict:
+        async with self._semaphore:
+            return await self.provider._send_request(
+                "lockunspent", [unlock, outputs], wallet_tag=tag
+            )
+
+    async def _sign(self, tag: str, psbt: str) -> str:
+        async with self._semaphore:
+            resp = await self.provider._send_request(
+                "walletprocesspsbt", [psbt, True, "ALL"], wallet_tag=tag
+            )
+        if not resp.get("result"):
+            raise ValueError(resp.get("error"))
+        return resp["result"]["psbt"]
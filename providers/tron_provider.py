@@ -1,26 +1,109 @@
+import asyncio
+import json
 import os
 
 from tronpy.providers import AsyncHTTPProvider
 from tronpy import AsyncTron
+from tronpy.async_contract import AsyncContract
 
 from .abstract_provider import AbstractRPCProvider
+from .metrics import instrument_provider
+from .rpc_transcript import attach_transport
+
+
+USDT_CONTRACT = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
 
 
 class TronProvider(AbstractRPCProvider):
+    def __init__(
+        self,
+        *args,
+        endpoint_uri: str | None = None,
+        api_key: str | None = None,
+        balance_concurrency: int = 16,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.endpoint_uri = endpoint_uri
+        self.api_key = api_key or os.environ.get("TRON_API_KEY")
+        self.balance_concurrency = balance_concurrency
+        self._client: AsyncTron | None = None
+        self._contracts: dict[tuple[str, str | None], asyncio.Future] = {}
+        self._decimals: dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> AsyncTron:
+        if self._client is None:
+            provider = AsyncHTTPProvider(
+                endpoint_uri=self.endpoint_uri, api_key=self.api_key
+            )
+            if self.transport is not None:
+                attach_transport(provider, self.transport)
+            if self.metrics is not None:
+                instrument_provider(provider, self.metrics)
+            self._client = AsyncTron(provider=provider)
+        return self._client
+
+    async def close(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.close()
+        await super().close()
+
+    async def get_contract(
+        self, address: str, abi: list | None = None
+    ) -> AsyncContract:
+        key = (address, None if abi is None else json.dumps(abi, sort_keys=True))
+
+        async def load():
+            contract = await self.client.get_contract(address)
+            if abi is not None:
+                contract.abi = abi
+            return contract
+
+        return await self._cached(self._contracts, key, load)
+
+    async def get_decimals(self, address: str) -> int:
+        async def load():
+            contract = await self.get_contract(address)
+            return await contract.functions.decimals()
+
+        return await self._cached(self._decimals, address, load)
+
+    async def _cached(self, cache: dict, key, load):
+        future = cache.get(key)
+        if future is None:
+            future = cache[key] = asyncio.ensure_future(load())
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if cache.get(key) is future:
+                del cache[key]
+            raise
+
     async def create_wallet(self, tag: str):
-        async with AsyncTron() as client:
-            return client.generate_address()
-
-    async def get_base_wallet_balance(self, address: str):
-        contract_address = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
-        base = address
-        async_provider = AsyncHTTPProvider(api_key=os.environ.get("TRON_API_KEY"))
-        async with AsyncTron(provider=async_provider, network="mainnet") as client:
-            cntr = await client.get_contract(contract_address)
-            precision = await cntr.functions.decimals()
-            balance = await cntr.functions.balanceOf(base)
-            balance = balance / 10**precision
-            return balance
+        return self.client.generate_address()
+
+    async def get_base_wallet_balance(
+        self, address: str, contract_address: str = USDT_CONTRACT
+    ):
+        cntr = await self.get_contract(contract_address)
+        precision = await self.get_decimals(contract_address)
+        balance = await cntr.functions.balanceOf(address)
+        balance = balance / 10**precision
+        return balance
+
+    async def get_trc20_balances(
+        self, addresses: list[str], contract_address: str = USDT_CONTRACT
+    ) -> dict[str, float]:
+        semaphore = asyncio.Semaphore(self.balance_concurrency)
+
+        async def balance(address):
+            async with semaphore:
+                return await self.get_base_wallet_balance(address, contract_address)
+
+        balances = await asyncio.gather(*(balance(address) for address in addresses))
+        return dict(zip(addresses, balances))
 
     async def send_from_base_wallet(self, wallet, amount):
         ...
@@ -0,0 +1,144 @@
+import asyncio
+from hashlib import sha256
+from typing import Awaitable, Callable
+
+try:
+    import zmq
+    import zmq.asyncio
+except ImportError:
+    zmq = None
+
+
+def _read_varint(raw: bytes, pos: int) -> tuple[int, int]:
+    prefix = raw[pos]
+    if prefix < 0xFD:
+        return prefix, pos + 1
+    size = {0xFD: 2, 0xFE: 4, 0xFF: 8}[prefix]
+    return int.from_bytes(raw[pos + 1 : pos + 1 + size], "little"), pos + 1 + size
+
+
+def txid_from_raw(raw: bytes) -> str:
+    if len(raw) > 5 and raw[4] == 0 and raw[5] != 0:
+        pos = 6
+        inputs, pos = _read_varint(raw, pos)
+        for _ in range(inputs):
+            script_len, pos = _read_varint(raw, pos + 36)
+            pos += script_len + 4
+        outputs, pos = _read_varint(raw, pos)
+        for _ in range(outputs):
+            script_len, pos = _read_varint(raw, pos + 8)
+            pos += script_len
+        raw = raw[:4] + raw[6:pos] + raw[-4:]
+    return sha256(sha256(raw).digest()).digest()[::-1].hex()
+
+
+class TransactionWaiter:
+    def __init__(
+        self,
+        zmq_address: str | None = None,
+        topics: tuple[str, ...] = ("hashtx",),
+        poll_initial: float = 0.25,
+        poll_max: float = 4.0,
+        reconnect_delay: float = 5.0,
+    ):
+        if zmq_address and zmq is None:
+            raise ImportError("pyzmq is required for ZMQ transaction notifications")
+        self.zmq_address = zmq_address
+        self.topics = topics
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.reconnect_delay = reconnect_delay
+        self._waiters: dict[str, set[asyncio.Event]] = {}
+        self._block_listeners: list[Callable[[str], None]] = []
+        self._subscription: asyncio.Task | None = None
+
+    async def wait(
+        self,
+        txid: str,
+        check: Callable[[], Awaitable[dict]],
+        timeout: float = 20.0,
+    ) -> dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = self.poll_initial
+        event = self._register(txid)
+        try:
+            while True:
+                resp = await check()
+                remaining = deadline - loop.time()
+                if resp.get("result") or remaining <= 0:
+                    return resp
+                try:
+                    await asyncio.wait_for(event.wait(), min(delay, remaining))
+                except asyncio.TimeoutError:
+                    delay = min(delay * 2, self.poll_max)
+                else:
+                    event.clear()
+        finally:
+            self._unregister(txid, event)
+
+    def add_block_listener(self, listener: Callable[[str], None]):
+        self._block_listeners.append(listener)
+
+    def start(self):
+        if self.zmq_address and (
+            self._subscription is None or self._subscription.done()
+        ):
+            self._subscription = asyncio.get_running_loop().create_task(
+                self._subscribe()
+            )
+
+    def notify(self, txid: str):
+        for event in self._waiters.get(txid, ()):
+            event.set()
+
+    async def close(self):
+        subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            subscription.cancel()
+            try:
+                await subscription
+            except asyncio.CancelledError:
+                pass
+
+    def _register(self, txid: str) -> asyncio.Event:
+        event = asyncio.Event()
+        self._waiters.setdefault(txid, set()).add(event)
+        self.start()
+        return event
+
+    def _unregister(self, txid: str, event: asyncio.Event):
+        events = self._waiters.get(txid)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            del self._waiters[txid]
+
+    async def _subscribe(self):
+        context = zmq.asyncio.Context.instance()
+        while True:
+            socket = context.socket(zmq.SUB)
+            try:
+                socket.connect(self.zmq_address)
+                for topic in self.topics:
+                    socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+                while True:
+                    topic, body, *_ = await socket.recv_multipart()
+                    self._dispatch(topic, body)
+            except zmq.ZMQError:
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                socket.close(linger=0)
+
+    def _dispatch(self, topic: bytes, body: bytes):
+        if topic == b"hashblock":
+            for listener in self._block_listeners:
+                listener(body.hex())
+            return
+        if not self._waiters:
+            return
+        if topic == b"hashtx":
+            self.notify(body.hex())
+        elif topic == b"rawtx":
+            self.notify(txid_from_raw(body))
@@ -0,0 +1,139 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+
+
+WALLET_NOT_LOADED = -18
+WALLET_ALREADY_LOADED = -35
+
+
+class _ResidentWallet:
+    __slots__ = ("refs", "loaded", "lock", "last_used")
+
+    def __init__(self):
+        self.refs = 0
+        self.loaded = False
+        self.lock = asyncio.Lock()
+        self.last_used = monotonic()
+
+
+class WalletResidencyManager:
+    def __init__(self, provider, max_loaded: int = 32, idle_timeout: float = 300.0):
+        self.provider = provider
+        self.max_loaded = max_loaded
+        self.idle_timeout = idle_timeout
+        self._wallets: OrderedDict[str, _ResidentWallet] = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._sweeper: asyncio.Task | None = None
+
+    @property
+    def loaded(self) -> list[str]:
+        return [tag for tag, wallet in self._wallets.items() if wallet.loaded]
+
+    @asynccontextmanager
+    async def hold(self, tag: str):
+        async with self.hold_many([tag]):
+            yield
+
+    @asynccontextmanager
+    async def hold_many(self, tags: list[str]):
+        tags = list(dict.fromkeys(tags))
+        wallets = []
+        for tag in tags:
+            wallet = self._wallets.get(tag)
+            if wallet is None:
+                wallet = self._wallets[tag] = _ResidentWallet()
+            self._wallets.move_to_end(tag)
+            wallet.refs += 1
+            wallets.append(wallet)
+        try:
+            await asyncio.gather(
+                *(
+                    self._ensure_loaded(tag, wallet)
+                    for tag, wallet in zip(tags, wallets)
+                )
+            )
+            yield
+        finally:
+            for wallet in wallets:
+                wallet.refs -= 1
+                wallet.last_used = monotonic()
+            if any(not wallet.refs for wallet in wallets):
+                self._schedule_eviction()
+
+    async def reload(self, tag: str) -> bool:
+        wallet = self._wallets.get(tag)
+        if wallet is None or not wallet.refs:
+            return False
+        async with wallet.lock:
+            wallet.loaded = await self._load(tag)
+        return wallet.loaded
+
+    def discard(self, tag: str):
+        wallet = self._wallets.get(tag)
+        if wallet is None:
+            return
+        wallet.loaded = False
+        if not wallet.refs:
+            del self._wallets[tag]
+
+    async def close(self):
+        sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None:
+            sweeper.cancel()
+            try:
+                await sweeper
+            except asyncio.CancelledError:
+                pass
+        for tag, wallet in list(self._wallets.items()):
+            await self._unload(tag, wallet)
+
+    async def _ensure_loaded(self, tag: str, wallet: _ResidentWallet):
+        async with wallet.lock:
+            if not wallet.loaded:
+                wallet.loaded = await self._load(tag)
+
+    async def _load(self, tag: str) -> bool:
+        resp = await self.provider.load_wallet_by_tag(tag)
+        error = resp.get("error") if resp else None
+        return not error or error.get("code") == WALLET_ALREADY_LOADED
+
+    async def _unload(self, tag: str, wallet: _ResidentWallet) -> bool:
+        async with wallet.lock:
+            if wallet.refs:
+                return False
+            if wallet.loaded:
+                await self.provider.unload_wallet_by_tag(tag)
+                wallet.loaded = False
+            if not wallet.refs and self._wallets.get(tag) is wallet:
+                del self._wallets[tag]
+            return True
+
+    def _schedule_eviction(self):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+        if len(self._wallets) > self.max_loaded:
+            self._wakeup.set()
+
+    async def _sweep(self):
+        while self._wallets:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.idle_timeout / 2)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._evict()
+
+    async def _evict(self):
+        now = monotonic()
+        resident = sum(wallet.loaded for wallet in self._wallets.values())
+        for tag, wallet in list(self._wallets.items()):
+            if wallet.refs:
+                continue
+            expired = now - wallet.last_used >= self.idle_timeout
+            if not expired and resident <= self.max_loaded:
+                continue
+            was_loaded = wallet.loaded
+            if await self._unload(tag, wallet) and was_loaded:
+                resident -= 1
@@ -0,0 +1,73 @@
+import asyncio
+
+from ..providers.header_index import HeaderIndex
+
+
+class FakeChain:
+    def __init__(self, tip: int):
+        self.hashes = [f"h{height}" for height in range(tip + 1)]
+        self.transactions: dict[str, int] = {}
+        self.fetched: list[str] = []
+
+    def _read_node(self, min_height: int | None = None):
+        return None
+
+    async def _send_batch(self, calls: list[tuple[str, list]], node=None) -> list:
+        tip = len(self.hashes) - 1
+        results = {
+            "getblockcount": lambda: tip,
+            "getbestblockhash": lambda: self.hashes[tip],
+        }
+        return [
+            {"result": self.hashes[params[0]]}
+            if method == "getblockhash"
+            else {"result": results[method]()}
+            for method, params in calls
+        ]
+
+    async def get_confs_from_network_many(self, txids: list[str]) -> dict:
+        self.fetched.extend(txids)
+        tip = len(self.hashes) - 1
+        return {
+            txid: {
+                "confirmations": tip - self.transactions[txid] + 1,
+                "blockhash": self.hashes[self.transactions[txid]],
+                "blockheight": self.transactions[txid],
+            }
+            for txid in txids
+        }
+
+    def mine(self, blocks: int):
+        tip = len(self.hashes)
+        self.hashes.extend(f"h{height}" for height in range(tip, tip + blocks))
+
+
+def test_settled_transactions_stay_tracked_below_the_window():
+    async def scenario():
+        chain = FakeChain(tip=1000)
+        chain.transactions["old"] = 950
+        index = HeaderIndex(chain, depth=144, refresh_interval=0)
+        first = await index.confirmations(["old"])
+        chain.mine(200)
+        later = await index.confirmations(["old"])
+        chain.mine(1)
+        last = await index.confirmations(["old"])
+        return chain, first, later, last
+
+    chain, first, later, last = asyncio.run(scenario())
+    assert first == {"old": 51}
+    assert later == {"old": 251}
+    assert last == {"old": 252}
+    assert chain.fetched == ["old"]
+
+
+def test_tracked_transactions_are_bounded():
+    async def scenario():
+        chain = FakeChain(tip=100)
+        chain.transactions.update({f"tx{height}": height for height in range(10)})
+        index = HeaderIndex(chain, max_tracked=3, refresh_interval=60)
+        await index.confirmations([f"tx{height}" for height in range(10)])
+        return index
+
+    index = asyncio.run(scenario())
+    assert list(index._tracked) == ["tx7", "tx8", "tx9"]
@@ -0,0 +1,104 @@
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from ..providers.json_decoder import (
+    JSONArrayStream,
+    decode_decimal,
+    dumps,
+    get_decoder,
+    to_satoshis,
+)
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.3:
+        return rng.choice(
+            [1, -2.5, 1e-8, "a,]}", 'q"uote', "\\", "ü€😀", None, True, [], {}]
+        )
+    if roll < 0.6:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {
+        f"key{index}": random_value(rng, depth + 1)
+        for index in range(rng.randint(0, 4))
+    }
+
+
+def feed(stream: JSONArrayStream, raw: bytes, size: int) -> list:
+    items = []
+    for start in range(0, len(raw), size):
+        items += stream.feed(raw[start : start + size])
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 65536])
+def test_stream_yields_the_target_array_for_any_chunking(size):
+    rng = random.Random(size)
+    for _ in range(50):
+        transactions = [random_value(rng) for _ in range(rng.randint(0, 6))]
+        error = {"code": -5, "data": [1, {"x": "]"}]} if rng.random() < 0.3 else None
+        document = {
+            "id": "1",
+            "result": {"hash": "ab", "tx": transactions, "after": [1]},
+            "error": error,
+        }
+        raw = json.dumps(
+            document, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5
+        ).encode()
+        stream = JSONArrayStream(("result", "tx"))
+        assert feed(stream, raw, size) == transactions
+        assert stream.found
+        assert stream.envelope == {"id": "1", "error": error}
+
+
+def test_stream_of_a_top_level_array():
+    stream = JSONArrayStream(())
+    assert feed(stream, b'[{"a": 1}, 2, "x"]', 2) == [{"a": 1}, 2, "x"]
+
+
+def test_stream_does_not_cut_numbers_at_chunk_boundaries():
+    stream = JSONArrayStream(("result",), Decimal)
+    assert stream.feed(b'{"result": [0.1, 12') == [Decimal("0.1")]
+    assert stream.feed(b"3.5e") == []
+    assert stream.feed(b"1]}") == [Decimal("1235")]
+
+
+def test_stream_without_the_target_array_is_not_found():
+    stream = JSONArrayStream(("result", "tx"))
+    raw = b'{"result": null, "error": {"code": -28, "message": "Loading"}, "id": "1"}'
+    assert feed(stream, raw, 5) == []
+    assert not stream.found
+    assert stream.envelope["error"]["code"] == -28
+
+
+def test_stream_keeps_only_the_pending_element_buffered():
+    transactions = [
+        {"txid": f"{index:064x}", "hex": "00" * 500} for index in range(2000)
+    ]
+    raw = json.dumps({"result": {"tx": transactions}, "error": None}).encode()
+    stream = JSONArrayStream(("result", "tx"))
+    count = peak = 0
+    for start in range(0, len(raw), 4096):
+        count += len(stream.feed(raw[start : start + 4096]))
+        peak = max(peak, len(stream._buffer))
+    assert count == len(transactions)
+    assert peak < 8192
+
+
+def test_decimal_decoder_keeps_amounts_exact():
+    response = decode_decimal(b'{"result": {"amount": 0.30000001}}')
+    assert response["result"]["amount"] == Decimal("0.30000001")
+    assert to_satoshis(response["result"]["amount"]) == 30_000_001
+    assert to_satoshis(0.1) == 10_000_000
+
+
+def test_decoders_and_encoder():
+    assert get_decoder(None) is None
+    assert get_decoder("decimal") is decode_decimal
+    assert get_decoder("fast")(b'{"a": [1]}') == {"a": [1]}
+    assert json.loads(dumps({"amount": Decimal("0.1")})) == {"amount": "0.1"}
+    with pytest.raises(KeyError):
+        get_decoder("yaml")
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from ..providers.metrics import RPCMetrics
+from ..providers.node_pool import NodePool
+
+
+def make_pool(heights: dict[str, int], latencies: dict[str, float], **options):
+    pool = NodePool(list(heights), **options)
+    for endpoint in pool.endpoints:
+        endpoint.height = heights[endpoint.url]
+        endpoint.latency = latencies[endpoint.url]
+    return pool
+
+
+def responder(delays: dict[str, float], failing: set[str] = frozenset()):
+    calls = []
+
+    async def call(url: str):
+        calls.append(url)
+        await asyncio.sleep(delays.get(url, 0))
+        if url in failing:
+            raise ConnectionError(url)
+        return url
+
+    return call, calls
+
+
+def test_reads_go_to_the_fastest_caught_up_node():
+    pool = make_pool(
+        {"primary": 100, "replica": 100, "lagging": 90},
+        {"primary": 0.05, "replica": 0.01, "lagging": 0.001},
+        hedge=False,
+    )
+    call, calls = responder({})
+    assert asyncio.run(pool.read(call)) == "replica"
+    assert [endpoint.url for endpoint in pool.candidates()] == ["replica", "primary"]
+
+
+def test_writes_go_to_the_primary():
+    pool = make_pool({"primary": 100, "replica": 100}, {"primary": 1, "replica": 0})
+    call, calls = responder({})
+    assert asyncio.run(pool.write(call)) == "primary"
+    assert calls == ["primary"]
+
+
+def test_slow_read_is_hedged_to_the_next_node():
+    pool = make_pool(
+        {"slow": 100, "fast": 100},
+        {"slow": 0.001, "fast": 0.002},
+        hedge_delay=0.02,
+        metrics=RPCMetrics(),
+    )
+    call, calls = responder({"slow": 1.0, "fast": 0.01})
+
+    async def scenario():
+        started = asyncio.get_running_loop().time()
+        result = await pool.read(call, "getblock")
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(scenario())
+    assert result == "fast"
+    assert calls == ["slow", "fast"]
+    assert elapsed < 0.5
+    assert pool.metrics.snapshot()["getblock"]["retries"] == 1
+    assert pool.endpoints[0].in_flight == 0
+
+
+def test_failed_read_fails_over_and_opens_the_circuit():
+    pool = make_pool(
+        {"broken": 100, "good": 100},
+        {"broken": 0.001, "good": 0.01},
+        hedge=False,
+        failure_threshold=2,
+        circuit_cooldown=60,
+    )
+    call, calls = responder({}, failing={"broken"})
+
+    async def scenario():
+        return [await pool.read(call) for _ in range(4)]
+
+    assert asyncio.run(scenario()) == ["good"] * 4
+    assert calls == ["broken", "good", "broken", "good", "good", "good"]
+    assert pool.status()[0]["circuit_open"]
+
+
+def test_read_raises_when_every_node_fails():
+    pool = make_pool({"a": 100, "b": 100}, {"a": 0.001, "b": 0.002}, hedge=False)
+    call, _ = responder({}, failing={"a", "b"})
+    with pytest.raises(ConnectionError):
+        asyncio.run(pool.read(call))
+
+
+def test_select_honours_a_minimum_height():
+    pool = make_pool(
+        {"primary": 100, "replica": 101, "lagging": 99},
+        {"primary": 0.05, "replica": 0.03, "lagging": 0.001},
+    )
+
+    async def scenario():
+        return pool.select().url, pool.select(min_height=101).url
+
+    assert asyncio.run(scenario()) == ("lagging", "replica")
+
+
+def test_health_checks_track_tips_and_unhealthy_nodes():
+    heights = {"a": 100, "b": 105}
+
+    async def probe(url: str) -> int:
+        if url == "down":
+            raise ConnectionError(url)
+        return heights[url]
+
+    async def scenario():
+        pool = NodePool(["a", "b", "down"], max_lag=2)
+        pool.probe = probe
+        await pool.check()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.tip == 105
+    assert [endpoint.healthy for endpoint in pool.endpoints] == [True, True, False]
+    assert [endpoint.url for endpoint in pool.candidates()] == ["b"]
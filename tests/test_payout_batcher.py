@@ -0,0 +1,134 @@
+import asyncio
+
+from ..providers.payout_batcher import PayoutBatcher, PayoutResult
+
+
+class FakeProvider:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches: list[dict[str, float]] = []
+
+    async def send_many_from_base_wallet(self, amounts: dict[str, float]) -> str:
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ValueError({"code": -6, "message": "Insufficient funds"})
+        self.batches.append(dict(amounts))
+        return f"tx{len(self.batches)}"
+
+    async def get_payout_outputs(self, txid: str) -> dict[str, int]:
+        batch = self.batches[int(txid[2:]) - 1]
+        return {address: vout for vout, address in enumerate(batch)}
+
+
+def test_payouts_in_one_window_share_a_transaction():
+    async def scenario():
+        provider = FakeProvider()
+        batcher = PayoutBatcher(provider, window=0.05)
+        results = await asyncio.gather(
+            *(batcher.submit(f"addr{index}", 0.1) for index in range(5))
+        )
+        return provider, results
+
+    provider, results = asyncio.run(scenario())
+    assert len(provider.batches) == 1
+    assert results == [PayoutResult("tx1", index) for index in range(5)]
+
+
+def test_full_batch_is_sent_before_the_window_ends():
+    async def scenario():
+        provider = FakeProvider()
+        batcher = PayoutBatcher(provider, window=60, max_size=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(f"addr{index}", 1) for index in range(6))),
+            1,
+        )
+        await batcher.close()
+        return provider, results
+
+    provider, results = asyncio.run(scenario())
+    assert [len(batch) for batch in provider.batches] == [3, 3]
+    assert [result.txid for result in results] == ["tx1"] * 3 + ["tx2"] * 3
+
+
+def test_duplicate_address_waits_for_the_next_batch():
+    async def scenario():
+        provider = FakeProvider()
+        batcher = PayoutBatcher(provider, window=0.02)
+        results = await asyncio.gather(
+            batcher.submit("same", 1), batcher.submit("same", 2)
+        )
+        return provider, results
+
+    provider, results = asyncio.run(scenario())
+    assert provider.batches == [{"same": 1}, {"same": 2}]
+    assert results == [PayoutResult("tx1", 0), PayoutResult("tx2", 0)]
+
+
+def test_send_failure_is_raised_to_every_payout_of_the_batch():
+    async def scenario():
+        batcher = PayoutBatcher(FakeProvider(fail=True), window=0.02)
+        return await asyncio.gather(
+            *(batcher.submit(f"addr{index}", 1) for index in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_close_sends_waiting_payouts():
+    async def scenario():
+        provider = FakeProvider()
+        batcher = PayoutBatcher(provider, window=60)
+        payout = asyncio.ensure_future(batcher.submit("addr", 1))
+        await asyncio.sleep(0)
+        await batcher.close()
+        return provider, await payout
+
+    provider, result = asyncio.run(scenario())
+    assert provider.batches == [{"addr": 1}]
+    assert result == PayoutResult("tx1", 0)
+
+
+def test_missing_outputs_give_no_vout():
+    class NoOutputs(FakeProvider):
+        async def get_payout_outputs(self, txid: str) -> dict[str, int]:
+            raise ValueError("gettransaction failed")
+
+    async def scenario():
+        batcher = PayoutBatcher(NoOutputs(), window=0.01)
+        return await batcher.submit("addr", 1)
+
+    assert asyncio.run(scenario()) == PayoutResult("tx1", None)
+
+
+def test_invalid_address_fails_only_its_own_payout():
+    class RejectsBadAddresses(FakeProvider):
+        def __init__(self):
+            super().__init__()
+            self.attempts = 0
+
+        async def send_many_from_base_wallet(self, amounts: dict[str, float]) -> str:
+            self.attempts += 1
+            if "bad" in amounts:
+                raise ValueError({"code": -5, "message": "Invalid address"})
+            return await super().send_many_from_base_wallet(amounts)
+
+    async def scenario():
+        provider = RejectsBadAddresses()
+        batcher = PayoutBatcher(provider, window=0.02)
+        addresses = [f"addr{index}" for index in range(7)]
+        addresses.insert(3, "bad")
+        results = await asyncio.gather(
+            *(batcher.submit(address, 1) for address in addresses),
+            return_exceptions=True,
+        )
+        return provider, results
+
+    provider, results = asyncio.run(scenario())
+    failed = [
+        index for index, result in enumerate(results) if isinstance(result, Exception)
+    ]
+    assert failed == [3]
+    assert sum(len(batch) for batch in provider.batches) == 7
+    assert provider.attempts == 7
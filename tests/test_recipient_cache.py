@@ -0,0 +1,69 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from ..coins.recipient_cache import RecipientCache
+
+
+class FakeChain:
+    def __init__(self, codes: dict[str, bytes]):
+        self.codes = codes
+        self.calls: list[str] = []
+        self.eth = SimpleNamespace(get_code=self.get_code)
+
+    async def get_code(self, address: str) -> bytes:
+        self.calls.append(address)
+        await asyncio.sleep(0)
+        return self.codes.get(address, b"")
+
+
+def test_contracts_are_cached_and_accounts_expire():
+    async def scenario():
+        chain = FakeChain({"0xC": b"\x60\x80"})
+        cache = RecipientCache(chain, eoa_ttl=0.05)
+        first = [await cache.is_contract(address) for address in ("0xC", "0xE")]
+        chain.codes["0xE"] = b"\xef\x01\x00"
+        cached = [await cache.is_contract(address) for address in ("0xC", "0xE")]
+        await asyncio.sleep(0.06)
+        expired = [await cache.is_contract(address) for address in ("0xC", "0xE")]
+        return chain, first, cached, expired
+
+    chain, first, cached, expired = asyncio.run(scenario())
+    assert first == cached == [True, False]
+    assert expired == [True, True]
+    assert chain.calls == ["0xC", "0xE", "0xE"]
+
+
+def test_saved_accounts_keep_their_expiry(tmp_path):
+    path = str(tmp_path / "recipients.json")
+
+    async def scenario():
+        chain = FakeChain({"0xC": b"\x60\x80"})
+        cache = RecipientCache(chain, path=path, eoa_ttl=60)
+        await cache.is_contract("0xC")
+        await cache.is_contract("0xE")
+        await cache.close()
+        reloaded = RecipientCache(chain, path=path, eoa_ttl=60)
+        await reloaded.is_contract("0xC")
+        await reloaded.is_contract("0xE")
+        return chain
+
+    assert asyncio.run(scenario()).calls == ["0xC", "0xE"]
+    with open(path) as file:
+        saved = json.load(file)
+    assert saved["0xc"] == [True, None]
+    assert saved["0xe"][0] is False
+
+
+def test_accounts_from_an_old_cache_file_are_checked_again(tmp_path):
+    path = tmp_path / "recipients.json"
+    path.write_text(json.dumps({"0xc": True, "0xe": False}))
+
+    async def scenario():
+        chain = FakeChain({"0xC": b"\x60\x80"})
+        cache = RecipientCache(chain, path=str(path))
+        await cache.is_contract("0xC")
+        await cache.is_contract("0xE")
+        return chain
+
+    assert asyncio.run(scenario()).calls == ["0xE"]
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from ..providers.btc_provider import BitcoinRPCProvider
+
+P2WPKH = "0014" + "11" * 20
+P2PKH = "76a914" + "22" * 20 + "88ac"
+
+
+class SweepNode:
+    def __init__(self, scripts: dict[str, list[str]], broadcast_error=None):
+        self.scripts = scripts
+        self.broadcast_error = broadcast_error
+        self.loaded: set[str] = set()
+        self.calls: list[tuple[str, str, list]] = []
+
+    async def request(self, path: str, payload: dict, send):
+        method, params = payload["method"], payload["params"]
+        tag = path.rsplit("/", 1)[-1] if path.startswith("/wallet/") else ""
+        self.calls.append((tag, method, params))
+        if method == "loadwallet":
+            self.loaded.add(params[0])
+            return self._result({"name": params[0]})
+        if method == "unloadwallet":
+            self.loaded.discard(params[0])
+            return self._result(None)
+        if tag and tag not in self.loaded:
+            return {"result": None, "error": {"code": -18}, "id": "1"}
+        if method == "listunspent":
+            return self._result(
+                [
+                    {"txid": f"{tag}-{vout}", "vout": vout, "amount": 0.001}
+                    | {"scriptPubKey": script}
+                    for vout, script in enumerate(self.scripts[tag])
+                ]
+            )
+        if method == "estimatesmartfee":
+            return self._result({"feerate": 0.00001})
+        if method == "lockunspent":
+            return self._result(True)
+        if method == "walletprocesspsbt":
+            return self._result({"psbt": tag})
+        if method == "finalizepsbt":
+            return self._result({"complete": True, "hex": "00"})
+        if method == "sendrawtransaction" and self.broadcast_error:
+            return {"result": None, "error": self.broadcast_error, "id": "1"}
+        return self._result(method)
+
+    def methods(self, tag: str) -> list[str]:
+        return [method for call_tag, method, _ in self.calls if call_tag == tag]
+
+    def loads(self, tag: str) -> int:
+        return sum(
+            method == "loadwallet" and params == [tag]
+            for _, method, params in self.calls
+        )
+
+    @staticmethod
+    def _result(result) -> dict:
+        return {"result": result, "error": None, "id": "1"}
+
+
+def sweep(node: SweepNode, tags: list[str], **options):
+    async def scenario():
+        provider = BitcoinRPCProvider(
+            "user", "password", "http://node", transport=node, **options
+        )
+        try:
+            return await provider.sweep_tags(tags, "bc1qmain")
+        finally:
+            await provider.close()
+
+    return asyncio.run(scenario())
+
+
+def test_each_wallet_is_loaded_once_and_held_until_broadcast():
+    tags = [f"tag{index}" for index in range(10)]
+    node = SweepNode({tag: [P2WPKH] for tag in tags})
+    results = sweep(node, tags, max_loaded_wallets=4)
+    assert [len(result.tags) for result in results] == [4, 4, 2]
+    for tag in tags:
+        assert node.loads(tag) == 1
+        assert node.methods(tag) == ["listunspent", "lockunspent", "walletprocesspsbt"]
+
+
+def test_fee_follows_the_input_script_types():
+    node = SweepNode({"tag": [P2WPKH, P2PKH]})
+    (result,) = sweep(node, ["tag"])
+    assert result.amount == round((200_000 - (11 + 31 + 68 + 148)) / 100_000_000, 8)
+
+
+def test_outputs_are_unlocked_when_the_broadcast_fails():
+    node = SweepNode({"tag": [P2WPKH, P2WPKH]}, broadcast_error={"code": -26})
+    with pytest.raises(ValueError):
+        sweep(node, ["tag"])
+    locks = [params for _, method, params in node.calls if method == "lockunspent"]
+    outputs = [{"txid": "tag-0", "vout": 0}, {"txid": "tag-1", "vout": 1}]
+    assert locks == [[False, outputs], [True, outputs]]
@@ -0,0 +1,183 @@
+import asyncio
+from hashlib import sha256
+
+import pytest
+
+from ..providers.tx_waiter import TransactionWaiter, txid_from_raw, zmq
+
+
+def dsha256(raw: bytes) -> str:
+    return sha256(sha256(raw).digest()).digest()[::-1].hex()
+
+
+def script(size: int, fill: int) -> bytes:
+    return bytes([size]) + bytes([fill]) * size
+
+
+def build_tx(witness: bool) -> tuple[bytes, bytes]:
+    version = (2).to_bytes(4, "little")
+    inputs = b"\x02" + b"".join(
+        bytes([index]) * 32 + index.to_bytes(4, "little") + script(0, 0) + b"\xff" * 4
+        for index in (1, 2)
+    )
+    outputs = b"\x02" + (
+        (50_000).to_bytes(8, "little")
+        + script(22, 0xAA)
+        + (1_000).to_bytes(8, "little")
+        + script(25, 0xBB)
+    )
+    locktime = (0).to_bytes(4, "little")
+    stripped = version + inputs + outputs + locktime
+    if not witness:
+        return stripped, stripped
+    witnesses = b"".join(b"\x02" + script(72, 0x30) + script(33, 0x02) for _ in (1, 2))
+    return version + b"\x00\x01" + inputs + outputs + witnesses + locktime, stripped
+
+
+def test_txid_from_legacy_raw():
+    raw, stripped = build_tx(witness=False)
+    assert txid_from_raw(raw) == dsha256(stripped)
+
+
+def test_txid_from_segwit_raw_strips_witness():
+    raw, stripped = build_tx(witness=True)
+    assert txid_from_raw(raw) == dsha256(stripped)
+    assert txid_from_raw(raw) != dsha256(raw)
+
+
+def test_wait_polls_with_exponential_backoff():
+    async def scenario():
+        waiter = TransactionWaiter(poll_initial=0.05, poll_max=0.2)
+        loop = asyncio.get_running_loop()
+        calls = []
+
+        async def check():
+            calls.append(loop.time())
+            return {"result": {"txid": "ab"} if len(calls) == 5 else None}
+
+        resp = await waiter.wait("ab", check, timeout=5)
+        return resp, [later - earlier for earlier, later in zip(calls, calls[1:])]
+
+    resp, gaps = asyncio.run(scenario())
+    assert resp == {"result": {"txid": "ab"}}
+    assert gaps == pytest.approx([0.05, 0.1, 0.2, 0.2], abs=0.03)
+
+
+def test_wait_returns_last_response_after_timeout():
+    async def scenario():
+        waiter = TransactionWaiter(poll_initial=0.01, poll_max=0.02)
+        return await waiter.wait("ab", lambda: _response(None), timeout=0.1)
+
+    assert asyncio.run(scenario()) == {"result": None}
+
+
+def test_notify_wakes_every_waiter_of_a_txid():
+    async def scenario():
+        waiter = TransactionWaiter(poll_initial=30, poll_max=30)
+        seen = asyncio.Event()
+
+        async def check():
+            return {"result": "ab" if seen.is_set() else None}
+
+        waits = [
+            asyncio.ensure_future(waiter.wait("ab", check, timeout=60))
+            for _ in range(3)
+        ]
+        other = asyncio.ensure_future(waiter.wait("cd", check, timeout=60))
+        await asyncio.sleep(0.05)
+        seen.set()
+        waiter.notify("ab")
+        results = await asyncio.wait_for(asyncio.gather(*waits), 1)
+        pending = not other.done()
+        other.cancel()
+        return results, pending, waiter._waiters
+
+    results, other_pending, waiters = asyncio.run(scenario())
+    assert results == [{"result": "ab"}] * 3
+    assert other_pending
+    assert not waiters
+
+
+async def _response(result):
+    return {"result": result}
+
+
+@pytest.mark.skipif(zmq is None, reason="pyzmq is not installed")
+@pytest.mark.parametrize("topic", ["hashtx", "rawtx"])
+def test_zmq_subscription_wakes_waiters(topic):
+    import zmq.asyncio
+
+    raw, _ = build_tx(witness=True)
+    txid = txid_from_raw(raw)
+    body = bytes.fromhex(txid) if topic == "hashtx" else raw
+
+    async def scenario():
+        context = zmq.asyncio.Context.instance()
+        publisher = context.socket(zmq.PUB)
+        port = publisher.bind_to_random_port("tcp://127.0.0.1")
+        waiter = TransactionWaiter(
+            f"tcp://127.0.0.1:{port}",
+            topics=(topic,),
+            poll_initial=30,
+            poll_max=30,
+        )
+        announced = asyncio.Event()
+        checks = 0
+
+        async def check():
+            nonlocal checks
+            checks += 1
+            return {"result": txid if announced.is_set() else None}
+
+        waits = [
+            asyncio.ensure_future(waiter.wait(txid, check, timeout=60))
+            for _ in range(2)
+        ]
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                announced.set()
+                await publisher.send_multipart([topic.encode(), body, b"\0" * 4])
+                if all(wait.done() for wait in waits):
+                    break
+            results = await asyncio.wait_for(asyncio.gather(*waits), 1)
+        finally:
+            await waiter.close()
+            publisher.close(linger=0)
+        return results, checks
+
+    results, checks = asyncio.run(scenario())
+    assert results == [{"result": txid}] * 2
+    assert checks == 4
+
+
+@pytest.mark.skipif(zmq is None, reason="pyzmq is not installed")
+def test_zmq_hashblock_reaches_block_listeners():
+    import zmq.asyncio
+
+    blockhash = "00" * 31 + "01"
+
+    async def scenario():
+        context = zmq.asyncio.Context.instance()
+        publisher = context.socket(zmq.PUB)
+        port = publisher.bind_to_random_port("tcp://127.0.0.1")
+        waiter = TransactionWaiter(
+            f"tcp://127.0.0.1:{port}", topics=("hashtx", "hashblock")
+        )
+        blocks = []
+        waiter.add_block_listener(blocks.append)
+        waiter.start()
+        try:
+            for _ in range(100):
+                await publisher.send_multipart(
+                    [b"hashblock", bytes.fromhex(blockhash), b"\0" * 4]
+                )
+                await asyncio.sleep(0.02)
+                if blocks:
+                    break
+        finally:
+            await waiter.close()
+            publisher.close(linger=0)
+        return blocks
+
+    assert blockhash in asyncio.run(scenario())
@@ -0,0 +1,170 @@
+import asyncio
+
+from ..providers.btc_provider import BitcoinRPCProvider
+from ..providers.wallet_residency import WalletResidencyManager
+
+
+class FakeProvider:
+    def __init__(self, load_delay: float = 0.01):
+        self.load_delay = load_delay
+        self.loaded: set[str] = set()
+        self.loads: list[str] = []
+        self.unloads: list[str] = []
+
+    async def load_wallet_by_tag(self, tag: str) -> dict:
+        self.loads.append(tag)
+        await asyncio.sleep(self.load_delay)
+        if tag in self.loaded:
+            return {"result": None, "error": {"code": -35}}
+        self.loaded.add(tag)
+        return {"result": {"name": tag}, "error": None}
+
+    async def unload_wallet_by_tag(self, tag: str) -> dict:
+        self.unloads.append(tag)
+        self.loaded.discard(tag)
+        return {"result": None, "error": None}
+
+
+def test_concurrent_holds_load_a_wallet_once():
+    async def scenario():
+        provider = FakeProvider()
+        wallets = WalletResidencyManager(provider, idle_timeout=60)
+
+        async def use():
+            async with wallets.hold("tag"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(use() for _ in range(20)))
+        await asyncio.gather(*(use() for _ in range(5)))
+        loaded = wallets.loaded
+        await wallets.close()
+        return provider, loaded
+
+    provider, loaded = asyncio.run(scenario())
+    assert provider.loads == ["tag"]
+    assert loaded == ["tag"]
+    assert provider.unloads == ["tag"]
+
+
+def test_already_loaded_wallet_counts_as_loaded():
+    async def scenario():
+        provider = FakeProvider()
+        provider.loaded.add("tag")
+        wallets = WalletResidencyManager(provider, idle_timeout=60)
+        async with wallets.hold("tag"):
+            loaded = wallets.loaded
+        await wallets.close()
+        return loaded
+
+    assert asyncio.run(scenario()) == ["tag"]
+
+
+def test_least_recently_used_wallets_are_evicted_over_the_limit():
+    async def scenario():
+        provider = FakeProvider(load_delay=0)
+        wallets = WalletResidencyManager(provider, max_loaded=2, idle_timeout=60)
+        for tag in ("a", "b", "c", "d"):
+            async with wallets.hold(tag):
+                pass
+        await asyncio.sleep(0.05)
+        loaded = sorted(wallets.loaded)
+        await wallets.close()
+        return provider, loaded
+
+    provider, loaded = asyncio.run(scenario())
+    assert loaded == ["c", "d"]
+    assert provider.unloads[:2] == ["a", "b"]
+
+
+def test_held_wallets_are_not_evicted():
+    async def scenario():
+        provider = FakeProvider(load_delay=0)
+        wallets = WalletResidencyManager(provider, max_loaded=1, idle_timeout=0.02)
+        release = asyncio.Event()
+
+        async def long_hold():
+            async with wallets.hold("busy"):
+                await release.wait()
+
+        task = asyncio.ensure_future(long_hold())
+        await asyncio.sleep(0)
+        async with wallets.hold("other"):
+            pass
+        await asyncio.sleep(0.1)
+        during = list(provider.unloads)
+        release.set()
+        await task
+        await asyncio.sleep(0.1)
+        after = list(provider.unloads)
+        await wallets.close()
+        return during, after
+
+    during, after = asyncio.run(scenario())
+    assert during == ["other"]
+    assert sorted(after) == ["busy", "other"]
+
+
+def test_discard_forgets_an_unloaded_wallet():
+    async def scenario():
+        provider = FakeProvider(load_delay=0)
+        wallets = WalletResidencyManager(provider, idle_timeout=60)
+        async with wallets.hold("tag"):
+            pass
+        wallets.discard("tag")
+        loaded = wallets.loaded
+        async with wallets.hold("tag"):
+            pass
+        await wallets.close()
+        return provider, loaded
+
+    provider, loaded = asyncio.run(scenario())
+    assert loaded == []
+    assert provider.loads == ["tag", "tag"]
+
+
+class RestartingNode:
+    def __init__(self):
+        self.loaded: set[str] = set()
+        self.calls: list[tuple[str, str]] = []
+
+    async def request(self, path: str, payload: dict, send):
+        self.calls.append((path, payload["method"]))
+        if payload["method"] == "loadwallet":
+            tag = payload["params"][0]
+            if tag in self.loaded:
+                return {"result": None, "error": {"code": -35}, "id": "1"}
+            self.loaded.add(tag)
+            return {"result": {"name": tag}, "error": None, "id": "1"}
+        if payload["method"] == "unloadwallet":
+            self.loaded.discard(payload["params"][0])
+            return {"result": None, "error": None, "id": "1"}
+        tag = path.rsplit("/", 1)[-1]
+        if tag not in self.loaded:
+            error = {"code": -18, "message": "Requested wallet does not exist"}
+            return {"result": None, "error": error, "id": "1"}
+        return {"result": "txid", "error": None, "id": "1"}
+
+
+def test_held_wallet_is_reloaded_after_the_node_forgets_it():
+    async def scenario():
+        node = RestartingNode()
+        provider = BitcoinRPCProvider("user", "password", "http://node", transport=node)
+        async with provider.wallets.hold("tag"):
+            first = await provider._send_request(
+                "gettransaction", ["txid"], wallet_tag="tag"
+            )
+            node.loaded.clear()
+            second = await provider._send_request(
+                "gettransaction", ["txid"], wallet_tag="tag"
+            )
+        unheld = await provider._send_request(
+            "gettransaction", ["txid"], wallet_tag="other"
+        )
+        await provider.close()
+        return node, first, second, unheld
+
+    node, first, second, unheld = asyncio.run(scenario())
+    assert first["result"] == second["result"] == "txid"
+    assert unheld["error"]["code"] == -18
+    assert [method for _, method in node.calls].count("loadwallet") == 2
+    assert node.calls.count(("/wallet/other", "gettransaction")) == 1